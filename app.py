@@ -1,10 +1,27 @@
+import os
 import streamlit as st
 import numpy as np
 from scipy.stats import norm
-import yfinance as yf
 import pandas as pd
 import plotly.graph_objects as go
 from datetime import datetime
+from functools import partial
+
+from quantedge.data import PriceCache, load_many
+from quantedge.cache import ResultCache, result_key
+from quantedge.adaptive import MAX_N as ADAPTIVE_MAX_N, adaptive_is
+from quantedge.export import FORMATS as EXPORT_FORMATS, draw_columns, summary_columns, to_bytes as export_bytes
+from quantedge.engine import is_shift, running_bands, simulate
+from quantedge.greeks import greeks
+from quantedge.jobs import JobRunner
+from quantedge.portfolio import align_returns, covariance, portfolio_mc
+from quantedge.paths import barrier_mc, barrier_prob, gbm_paths
+from quantedge.qmc import qmc_mc
+from quantedge.risk import LEVELS as RISK_LEVELS
+from quantedge.sweep import sweep_grid
+from quantedge.screener import ESTIMATORS as SCREEN_ESTIMATORS, screen
+from quantedge.telemetry import Telemetry, array_info, arrays_of
+from quantedge.render import density_bar, edges, fan_traces, log_index, path_trace
 
 # --- PAGE CONFIG ---
 st.set_page_config(
@@ -100,6 +117,11 @@ h1,h2,h3{font-family:var(--display)!important;}
 </style>
 """, unsafe_allow_html=True)
 
+@st.cache_resource
+def market_cache():
+    # one on-disk price cache shared by every session in this process
+    return PriceCache()
+
 # ─── HEADER ──────────────────────────────────────────────────────────────────
 st.markdown("""
 <div class="qe-header">
@@ -129,7 +151,7 @@ st.markdown("""
   </div>
   <div class="qe-stats-bar">
     <span><b>ENGINE</b>&nbsp;&nbsp;Black-Scholes GBM</span>
-    <span><b>METHOD</b>&nbsp;&nbsp;Naive MC + Importance Sampling</span>
+    <span><b>METHOD</b>&nbsp;&nbsp;Naive MC + Importance Sampling + Sobol QMC</span>
     <span><b>RISK</b>&nbsp;&nbsp;VaR / CVaR / Black Swan</span>
     <span><b>DATA</b>&nbsp;&nbsp;Yahoo Finance Real-Time</span>
   </div>
@@ -165,18 +187,16 @@ with st.sidebar:
     if st.button("⬡  FETCH MARKET DATA", use_container_width=True):
         with st.spinner("Connecting to market feed..."):
             try:
-                stock = yf.Ticker(ticker)
-                hist  = stock.history(period=data_period)
-                hist["Log Returns"] = np.log(hist["Close"] / hist["Close"].shift(1))
-                dr = hist["Log Returns"].dropna()
+                ftel = Telemetry("fetch", ticker=ticker, period=data_period)
+                with ftel.stage("fetch") as rec:
+                    hist, stats, hit = market_cache().load(ticker, data_period)
+                    rec.update(cached=hit, rows=len(hist))
+                st.session_state["fetch_telemetry"] = ftel
                 st.session_state.update({
-                    "sigma": dr.std()*np.sqrt(252),
-                    "S0": hist["Close"].iloc[-1],
-                    "hist": hist, "ticker": ticker,
-                    "skewness": dr.skew(), "kurtosis": dr.kurtosis(),
+                    **stats, "hist": hist, "ticker": ticker,
                     "data_fetched": True
                 })
-                st.success(f"✓ {ticker} data loaded")
+                st.success(f"✓ {ticker} data loaded" + (" (cache)" if hit else ""))
             except Exception as e:
                 st.error(f"Feed error: {e}")
 
@@ -203,7 +223,13 @@ with st.sidebar:
     K         = S0 * (crash_pct / 100)
     T         = st.slider("Time Horizon (Years)", 0.25, 5.0, 1.0, 0.25)
     r         = st.number_input("Risk-Free Rate",  value=0.05, format="%.4f")
-    N_sims    = st.select_slider("Simulations (N)", options=[500,1000,2000,5000,10000,20000], value=5000)
+    N_sims    = st.select_slider("Simulations (N)", value=5000, format_func=lambda n: f"{n:,}",
+        options=[500,1000,2000,5000,10000,20000,100_000,1_000_000,10_000_000,100_000_000])
+    seed      = st.number_input("Random Seed", value=42, min_value=0, step=1)
+    workers   = int(st.number_input("Worker Processes", min_value=1, max_value=os.cpu_count() or 1, value=1))
+    bar_steps = st.select_slider("Barrier Monitoring Steps", options=[4,12,52,252], value=12)
+    target    = st.select_slider("Adaptive IS Target (rel. se)", options=[.05,.02,.01,.005,.002,.001],
+                                 value=.01, format_func=lambda x: f"{x:.1%}")
 
     st.markdown("""
     <div class="sb-section">
@@ -218,7 +244,98 @@ with st.sidebar:
     """, unsafe_allow_html=True)
 
     show_confidence = st.checkbox("95% Confidence Bands", value=True)
-    path_count      = st.slider("Path Count", 10, 200, 50)
+    path_mode       = st.radio("Path Display", ["Paths","Quantile Fan"], horizontal=True)
+    path_count      = st.slider("Path Count", 10, 500, 50, disabled=path_mode!="Paths")
+    path_sampler    = st.radio("Path Sampler", ["Pseudo-random","Sobol QMC"], horizontal=True)
+
+    st.markdown("""
+    <div class="sb-section">
+      <svg width="14" height="14" viewBox="0 0 14 14" fill="none">
+        <rect x="1" y="7" width="3" height="6" fill="#00ff87" rx=".5"/>
+        <rect x="5.5" y="4" width="3" height="9" fill="#00b4d8" rx=".5"/>
+        <rect x="10" y="1" width="3" height="12" fill="#a855f7" rx=".5"/>
+      </svg>
+      <span style="color:#00ff87;">Portfolio Mode</span>
+    </div>
+    """, unsafe_allow_html=True)
+
+    pf_text   = st.text_area("Holdings (TICKER or TICKER:weight)", value="AAPL, MSFT, NVDA, JPM, XOM, JNJ")
+    pf_shrink = st.selectbox("Covariance Shrinkage", ["ledoit-wolf","none"])
+    pf_loss   = st.slider("Portfolio Loss Threshold (%)", 5, 60, 20)
+    pf_N      = st.select_slider("Portfolio Scenarios", value=100_000, format_func=lambda n: f"{n:,}",
+        options=[10_000,100_000,1_000_000,10_000_000])
+
+    if st.button("⬡  RUN PORTFOLIO", use_container_width=True):
+        with st.spinner("Fetching holdings and simulating portfolio..."):
+            hold = [h.split(":") for h in pf_text.replace(",", " ").split() if h.strip()]
+            wts  = {h[0].upper(): float(h[1]) if len(h)>1 else 1. for h in hold}
+            hists, _, errs = load_many(list(wts), data_period, market_cache())
+            if len(hists) < 2:
+                st.error("Portfolio mode needs at least two tickers with data")
+            else:
+                try:
+                    R        = align_returns(hists)
+                    cov, a   = covariance(R.values, None if pf_shrink=="none" else pf_shrink)
+                    st.session_state["portfolio"] = dict(
+                        res=portfolio_mc([wts[t] for t in R.columns], cov, T, r, pf_N, pf_loss/100,
+                                         seed=int(seed), tickers=list(R.columns), shrink=a),
+                        cov=cov, days=len(R), errors=errs, T=T)
+                except ValueError as e:
+                    st.error(f"Portfolio mode: {e}")
+            for t, e in errs.items():
+                st.warning(f"{t}: {e}")
+
+    st.markdown("""
+    <div class="sb-section">
+      <svg width="14" height="14" viewBox="0 0 14 14" fill="none">
+        <rect x="1" y="1" width="5" height="5" fill="#a855f7" opacity=".9"/>
+        <rect x="8" y="1" width="5" height="5" fill="#a855f7" opacity=".5"/>
+        <rect x="1" y="8" width="5" height="5" fill="#a855f7" opacity=".3"/>
+        <rect x="8" y="8" width="5" height="5" fill="#a855f7" opacity=".7"/>
+      </svg>
+      <span style="color:#a855f7;">Parameter Sweep</span>
+    </div>
+    """, unsafe_allow_html=True)
+
+    sw_crash = st.slider("Sweep Crash Range (%)", 50, 95, (50, 95))
+    sw_T     = st.slider("Sweep Horizon Range (Years)", 0.25, 5.0, (0.25, 5.0), 0.25)
+    sw_vol   = st.slider("Sweep Volatility Range", 0.05, 1.0, (0.10, 0.60), 0.05)
+    sw_dims  = st.selectbox("Grid (crash × horizon × vol)", ["50×20×10","25×10×5","100×40×20"])
+
+    if st.button("⬡  RUN SWEEP", use_container_width=True):
+        nk,nt,nv = map(int, sw_dims.split("×"))
+        with st.spinner("Sweeping parameter grid..."):
+            st.session_state["sweep"] = sweep_grid(np.linspace(*sw_crash,nk)/100, np.linspace(*sw_T,nt),
+                                                   np.linspace(*sw_vol,nv), r, seed=int(seed))
+
+    st.markdown("""
+    <div class="sb-section">
+      <svg width="14" height="14" viewBox="0 0 14 14" fill="none">
+        <line x1="1" y1="3" x2="13" y2="3" stroke="#ff3b5c" stroke-width="1.5"/>
+        <line x1="1" y1="7" x2="10" y2="7" stroke="#ff3b5c" stroke-width="1.5" opacity=".7"/>
+        <line x1="1" y1="11" x2="6" y2="11" stroke="#ff3b5c" stroke-width="1.5" opacity=".4"/>
+      </svg>
+      <span style="color:#ff3b5c;">Universe Screener</span>
+    </div>
+    """, unsafe_allow_html=True)
+
+    sc_text = st.text_area("Watchlist (tickers, any separator)", value="AAPL MSFT NVDA JPM XOM JNJ")
+    sc_vol  = st.selectbox("Volatility Estimator", list(SCREEN_ESTIMATORS),
+                           format_func=lambda k: k.replace("_","–").title())
+    sc_flag = st.slider("MC Refinement for Top (%)", 1, 100, 10)
+    sc_N    = st.select_slider("Bootstrap Paths per Flagged Name", value=20_000, format_func=lambda n: f"{n:,}",
+        options=[5_000,20_000,100_000])
+
+    # crash level, horizon and rate come from Simulation Parameters above
+    if st.button("⬡  RUN SCREENER", use_container_width=True):
+        names = list(dict.fromkeys(t.upper() for t in sc_text.replace(",", " ").replace(";", " ").split()))
+        with st.spinner(f"Loading {len(names)} histories and scoring..."):
+            hists, _, errs = load_many(names, data_period, market_cache())
+            if not hists:
+                st.error("No watchlist ticker returned data")
+            else:
+                st.session_state["screen"] = screen(hists, crash_pct/100, T, r, sc_vol, 1-sc_flag/100,
+                                                    sc_N, seed=int(seed), errors=errs)
 
     if st.session_state.get("data_fetched"):
         sk       = st.session_state.get("skewness", 0)
@@ -236,26 +353,6 @@ with st.sidebar:
         </div>
         """, unsafe_allow_html=True)
 
-# ─── FUNCTIONS ────────────────────────────────────────────────────────────────
-def naive_mc(S0, K, T, r, sigma, N):
-    Z  = np.random.normal(0, 1, N)
-    ST = S0 * np.exp((r-.5*sigma**2)*T + sigma*np.sqrt(T)*Z)
-    p  = (ST < K).astype(float)
-    return np.mean(p), np.std(p)/np.sqrt(N), ST, p
-
-def is_mc(S0, K, T, r, sigma, N):
-    sb = (np.log(K/S0)-(r-.5*sigma**2)*T)/(sigma*np.sqrt(T))
-    mu = sb-.5
-    Z  = np.random.normal(mu, 1, N)
-    ST = S0*np.exp((r-.5*sigma**2)*T+sigma*np.sqrt(T)*Z)
-    w  = np.exp(-mu*Z+.5*mu**2)
-    wp = (ST<K).astype(float)*w
-    return np.mean(wp), np.std(wp)/np.sqrt(N), ST, wp
-
-def var_cvar(ret, c=.95):
-    v = np.percentile(ret,(1-c)*100)
-    return v, ret[ret<=v].mean()
-
 # ─── PLOTLY THEME ─────────────────────────────────────────────────────────────
 PT = dict(
     template="plotly_dark",
@@ -267,6 +364,25 @@ PT = dict(
     legend=dict(bgcolor="rgba(13,17,23,.8)", bordercolor="#1a2e3d", borderwidth=1)
 )
 
+FAN_PATHS = 2000       # paths summarised by the quantile-fan view
+BARRIER_N = 1_000_000  # barrier walks cost N·steps draws, so cap their count
+GREEKS_N  = 1 << 22    # sensitivities replay a prefix of the run's draws
+
+# ─── LAYOUT HELPERS ───────────────────────────────────────────────────────────
+# section header label
+def section(svg, label, color):
+    st.markdown(f'<div class="section-header">{svg}<span style="color:{color};">{label}</span></div>',
+                unsafe_allow_html=True)
+
+# stat card rendered into one st.column
+def card(col, label, value, sub, clr):
+    col.markdown(f"""
+    <div class="stat-card" style="border-top:2px solid {clr};">
+      <div class="stat-label">{label}</div>
+      <div class="stat-value" style="color:{clr};">{value}</div>
+      <div class="stat-sub">{sub}</div>
+    </div>""", unsafe_allow_html=True)
+
 # ─── RUN BUTTON ───────────────────────────────────────────────────────────────
 st.markdown("""
 <div style="margin-bottom:8px;">
@@ -277,24 +393,148 @@ st.markdown("""
 </div>
 """, unsafe_allow_html=True)
 
+@st.cache_resource
+def result_cache():
+    # simulation results shared across reruns and sessions, keyed by parameters
+    return ResultCache()
+
+@st.cache_resource
+def job_runner():
+    # bounded worker pool shared by every session; extra runs queue
+    return JobRunner()
+
+# (stage, cache key, fn, args, kwargs) for each cached estimator of a pinned run
+def run_specs(p, workers):
+    S0,K,T,r,sigma,N,seed = (p[k] for k in ("S0","K","T","r","sigma","N","seed"))
+    N_bar = min(N, BARRIER_N)
+    return [
+        ("simulate/naive", result_key(S0,K,T,r,sigma,N,seed,"naive"),
+            simulate, (S0,K,T,r,sigma,N,"naive"), dict(seed=seed,workers=workers)),
+        ("simulate/is",    result_key(S0,K,T,r,sigma,N,seed,"is"),
+            simulate, (S0,K,T,r,sigma,N,"is"),    dict(seed=seed,workers=workers)),
+        ("barrier",        result_key(S0,K,T,r,sigma,N_bar,seed,"barrier",steps=p["bar_steps"]),
+            barrier_mc, (S0,K,T,r,sigma,N_bar,p["bar_steps"],seed), {}),
+        ("qmc/naive",      result_key(S0,K,T,r,sigma,N,seed,"qmc-naive"),
+            qmc_mc, (S0,K,T,r,sigma,N,"naive"), dict(seed=seed)),
+        ("qmc/is",         result_key(S0,K,T,r,sigma,N,seed,"qmc-is"),
+            qmc_mc, (S0,K,T,r,sigma,N,"is"),    dict(seed=seed)),
+        ("adaptive",       result_key(S0,K,T,r,sigma,0,seed,"adaptive",target=p["target"]),
+            adaptive_is, (S0,K,T,r,sigma,p["target"],seed), {}),
+        ("greeks/naive",   result_key(S0,K,T,r,sigma,min(N,GREEKS_N),seed,"greeks-naive"),
+            greeks, (S0,K,T,r,sigma,min(N,GREEKS_N),"naive",seed), {}),
+        ("greeks/is",      result_key(S0,K,T,r,sigma,min(N,GREEKS_N),seed,"greeks-is"),
+            greeks, (S0,K,T,r,sigma,min(N,GREEKS_N),"is",seed), {}),
+    ]
+
+# draws each job step makes, for its progress bar (adaptive stops early once on target)
+def step_draws(p):
+    N, N_g = p["N"], min(p["N"], GREEKS_N)
+    return {"simulate/naive": N, "simulate/is": N, "barrier": min(N, BARRIER_N), "qmc/naive": N,
+            "qmc/is": N, "adaptive": ADAPTIVE_MAX_N, "greeks/naive": N_g, "greeks/is": N_g}
+
+# one job step: lands in the result cache, reporting (and checking for cancel) every chunk
+def cached_step(rcache, key, fn, args, kw, report):
+    return rcache.get_or_run(key, fn, *args, **kw, progress=report)
+
+def job_view(job, snap):
+    N     = job.tags["draws"].get(snap["step"], 1)
+    sims  = [s for s in snap["steps"] if s.startswith("simulate/")]
+    n_now = snap["partial"].get(snap["step"], (0,))[0]
+    frac  = (len(snap["completed"])+min(n_now/N, 1))/len(snap["steps"])
+    label = {"queued":  f"Queued — {job_runner().active()} run(s) on {job_runner().workers} worker(s)",
+             "running": f"{snap['step']} · {n_now:,} / {N:,} draws",
+             "cancelled": f"Cancelled during {snap['step']}", "failed": f"Failed: {snap['error']}"}
+    st.progress(frac, text=f"{label.get(snap['status'], snap['status'])} · {snap['elapsed']:.1f}s")
+    cols = st.columns(len(sims)+1)
+    for col,s,clr in zip(cols, sims, ("#f0b429","#00b4d8")):
+        n,p,se = snap["partial"].get(s, (0,0.,0.))
+        card(col, f"{s.split('/')[1].upper()} · partial", f"{p:.4%}", f"±{1.96*se:.4%} · n={n:,}", clr)
+    card(cols[-1], "Stages done", f"{len(snap['completed'])}/{len(snap['steps'])}",
+         ", ".join(snap["completed"]) or "—", "#00ff87")
+    if any(len(snap["trace"].get(s, ())) > 1 for s in sims):
+        fl = go.Figure()
+        for s,clr in zip(sims, ("240,180,41","0,180,216")):
+            tr = np.array(snap["trace"].get(s, ()), dtype=float).reshape(-1,3)
+            fl.add_trace(go.Scatter(x=tr[:,0], y=tr[:,1]+1.96*tr[:,2], mode="lines", line=dict(width=0), showlegend=False, hoverinfo="skip"))
+            fl.add_trace(go.Scatter(x=tr[:,0], y=tr[:,1]-1.96*tr[:,2], mode="lines", line=dict(width=0),
+                fill="tonexty", fillcolor=f"rgba({clr},.1)", showlegend=False, hoverinfo="skip"))
+            fl.add_trace(go.Scatter(x=tr[:,0], y=tr[:,1], mode="lines+markers", name=s, line=dict(color=f"rgb({clr})",width=1.5)))
+        fl.update_layout(height=300, title="Live Convergence", xaxis_title="Draws", yaxis_title="P(crash)", **PT)
+        st.plotly_chart(fl, use_container_width=True)
+
+# polls the running job; hands over to the full dashboard once it finishes
+@st.fragment(run_every=.5)
+def job_panel():
+    job  = st.session_state["job"]
+    snap = job.snapshot()
+    if job.done:
+        st.rerun()
+    job_view(job, snap)
+    if st.button("■  CANCEL RUN", use_container_width=True):
+        job.cancel()
+
+# RUN pins the simulation parameters and starts a background job; later reruns
+# (display widgets, other sidebar edits) redraw from the cached results
 if st.button("▶  RUN ADVANCED SIMULATION", use_container_width=True):
+    if "job" in st.session_state:
+        st.session_state["job"].cancel()
+    params = dict(S0=S0, K=K, T=T, r=r, sigma=sigma, N=N_sims,
+                  seed=int(seed), crash_pct=crash_pct, bar_steps=bar_steps, target=target)
+    st.session_state["job"] = job_runner().submit(
+        [(stage, partial(cached_step, result_cache(), key, fn, args, kw))
+         for stage,key,fn,args,kw in run_specs(params, workers)], N=N_sims, seed=int(seed),
+        draws=step_draws(params))
+    st.session_state["job_params"] = params
+
+if "job" in st.session_state:
+    job = st.session_state["job"]
+    if job.status == "done":
+        st.session_state["run"] = st.session_state.pop("job_params")
+        st.session_state["job_telemetry"] = st.session_state.pop("job").tel
+    elif job.done:
+        job_view(job, job.snapshot())
+        if st.button("✕  DISMISS", use_container_width=True):
+            del st.session_state["job"]
+            st.rerun()
+    else:
+        job_panel()
+
+if "run" in st.session_state:
+    S0,K,T,r,sigma,N_sims,seed,crash_pct,bar_steps,target = (st.session_state["run"][k]
+        for k in ("S0","K","T","r","sigma","N","seed","crash_pct","bar_steps","target"))
+    rcache = result_cache()
+    tel    = Telemetry("run", ticker=st.session_state.get("ticker"), N=N_sims, seed=seed)
+
+    # cached computation timed as one telemetry stage
+    def staged(stage, key, fn, args=(), kw={}):
+        with tel.stage(stage, cached=key in rcache) as rec:
+            res = rcache.get_or_run(key, fn, *args, **kw)
+            rec["arrays"] = arrays_of(res)
+        return res
+
+    # normally all cache hits — the background job computed them
     with st.spinner("Executing Monte Carlo paths..."):
-        np_p,np_se,np_ST,np_tr = naive_mc(S0,K,T,r,sigma,N_sims)
-        is_p,is_se,is_ST,is_tr = is_mc(S0,K,T,r,sigma,N_sims)
+        nm,im,bm,qn,qi,am,gn,gi = (staged(*spec) for spec in run_specs(st.session_state["run"], workers))
+        np_p,np_se,np_ST,np_tr = nm.p,nm.se,nm.ST,nm.tr
+        is_p,is_se,is_ST,is_tr = im.p,im.se,im.ST,im.tr
         d2        = (np.log(S0/K)+(r-.5*sigma**2)*T)/(sigma*np.sqrt(T))
         true_prob = norm.cdf(-d2)
+        touch     = barrier_prob(S0,K,T,r,sigma)
+        err_b     = abs(bm["p"]-touch)/touch*100 if touch else 0
         np_ret    = (np_ST-S0)/S0
-        is_ret    = (is_ST-S0)/S0
-        v95,cv95  = var_cvar(np_ret,.95)
-        v99,cv99  = var_cvar(np_ret,.99)
+        # both levels from one partition, with bootstrap CIs; the IS draws, reweighted
+        # by their likelihood ratios, give a second, tail-focused estimate over all N
+        rn        = staged("risk/naive", result_key(S0,K,T,r,sigma,N_sims,seed,"risk-naive"),
+                        nm.tail_risk, (RISK_LEVELS,), dict(seed=seed))
+        ri        = staged("risk/is", result_key(S0,K,T,r,sigma,N_sims,seed,"risk-is"),
+                        im.tail_risk, (RISK_LEVELS,), dict(seed=seed))
+        (v95,v99),(cv95,cv99) = rn.var, rn.cvar
+        pct       = lambda ci: f"[{ci[0]*100:.2f}, {ci[1]*100:.2f}]%" if np.isfinite(ci).all() else "n/a"
         vr        = (np_se**2/is_se**2) if is_se>0 else 0
         err_n     = abs(np_p-true_prob)/true_prob*100 if true_prob else 0
         err_i     = abs(is_p-true_prob)/true_prob*100 if true_prob else 0
-
-    # helper: section header label
-    def section(svg, label, color):
-        st.markdown(f'<div class="section-header">{svg}<span style="color:{color};">{label}</span></div>',
-                    unsafe_allow_html=True)
+        # achieved precision per unit time, 1/(se²·seconds): higher is better
+        eff       = lambda res: 1/(res.se**2*res.elapsed) if res.se>0 and res.elapsed>0 else float("inf")
 
     # ═══ RISK OVERVIEW ═══════════════════════════════════════════════════════
     section("""<svg width="16" height="16" viewBox="0 0 16 16" fill="none">
@@ -305,47 +545,109 @@ if st.button("▶  RUN ADVANCED SIMULATION", use_container_width=True):
 
     # 4 stat cards — each in its own st.column
     c1,c2,c3,c4 = st.columns(4)
-    def card(col, label, value, sub, clr):
-        col.markdown(f"""
-        <div class="stat-card" style="border-top:2px solid {clr};">
-          <div class="stat-label">{label}</div>
-          <div class="stat-value" style="color:{clr};">{value}</div>
-          <div class="stat-sub">{sub}</div>
-        </div>""", unsafe_allow_html=True)
 
     card(c1,"Analytical P(crash)",f"{true_prob:.6f}","Black-Scholes Closed Form","#00ff87")
-    card(c2,"Naive MC Estimate",  f"{np_p:.6f}",    f"±{np_se:.6f} | err {err_n:.2f}%","#f0b429")
-    card(c3,"Importance Sampling",f"{is_p:.6f}",    f"±{is_se:.6f} | err {err_i:.2f}%","#00b4d8")
+    card(c2,"Naive MC Estimate",  f"{np_p:.6f}",    f"±{np_se:.6f} | err {err_n:.2f}% | {eff(nm):.1e}/s","#f0b429")
+    card(c3,"Importance Sampling",f"{is_p:.6f}",    f"±{is_se:.6f} | err {err_i:.2f}% | {eff(im):.1e}/s","#00b4d8")
     card(c4,"Variance Reduction", f"{vr:.2f}×",     "IS Efficiency Gain","#a855f7")
 
     st.markdown("<div style='height:16px'></div>", unsafe_allow_html=True)
 
+    # randomized QMC: std-error from the spread of independent Sobol scrambles
+    q1,q2,q3,q4 = st.columns(4)
+    qerr = lambda res: abs(res.p-true_prob)/true_prob*100 if true_prob else 0
+    card(q1,"Sobol QMC",          f"{qn.p:.6f}",    f"±{qn.se:.6f} | err {qerr(qn):.2f}% | {eff(qn):.1e}/s","#f0b429")
+    card(q2,"Sobol QMC + IS",     f"{qi.p:.6f}",    f"±{qi.se:.6f} | err {qerr(qi):.2f}% | {eff(qi):.1e}/s","#00b4d8")
+    card(q3,"QMC Gain vs Naive",  f"{eff(qn)/eff(nm):.1f}×", f"precision/sec | N={qn.n:,} ({len(qn.estimates)} scrambles)","#a855f7")
+    card(q4,"QMC+IS Gain vs IS",  f"{eff(qi)/eff(im):.1f}×", "precision/sec, 1/(se²·t)","#a855f7")
+
+    st.markdown("<div style='height:16px'></div>", unsafe_allow_html=True)
+
+    # cross-entropy tuned drift, sampled in batches until se/p reaches the target
+    a1,a2,a3,a4 = st.columns(4)
+    card(a1,"Adaptive IS (CE)",   f"{am.p:.6f}",    f"±{am.se:.6f} | err {qerr(am):.2f}% | {eff(am):.1e}/s","#00b4d8")
+    card(a2,"Tuned Drift μ*",     f"{am.mu:.3f}",   f"default shift {is_shift(S0,K,T,r,sigma):.3f} | pilot {am.pilot:,}","#f0b429")
+    card(a3,"Samples to Target",  f"{am.n:,}",      f"rel. se {am.rse:.2%} {'≤' if am.converged else '>'} {am.target:.1%} in {am.elapsed:.2f}s",
+         "#00ff87" if am.converged else "#ff3b5c")
+    card(a4,"CE Variance Reduction",f"{nm.trials.var/am.trials.var:.2f}×" if am.trials.var>0 else "—",
+         f"per-sample vs naive | default IS {vr:.2f}×","#a855f7")
+
+    st.markdown("<div style='height:16px'></div>", unsafe_allow_html=True)
+
     # VaR / CVaR native Streamlit metrics
     m1,m2,m3,m4 = st.columns(4)
-    m1.metric("VaR 95%",  f"{v95*100:.2f}%",  delta=f"${v95*S0:.2f}",  delta_color="inverse")
-    m2.metric("CVaR 95%", f"{cv95*100:.2f}%", delta=f"${cv95*S0:.2f}", delta_color="inverse")
-    m3.metric("VaR 99%",  f"{v99*100:.2f}%",  delta=f"${v99*S0:.2f}",  delta_color="inverse")
-    m4.metric("CVaR 99%", f"{cv99*100:.2f}%", delta=f"${cv99*S0:.2f}", delta_color="inverse")
+    m1.metric("VaR 95%",  f"{v95*100:.2f}%",  delta=f"${v95*S0:.2f}",  delta_color="inverse", help=f"95% bootstrap CI {pct(rn.var_ci[:,0])}")
+    m2.metric("CVaR 95%", f"{cv95*100:.2f}%", delta=f"${cv95*S0:.2f}", delta_color="inverse", help=f"95% bootstrap CI {pct(rn.cvar_ci[:,0])}")
+    m3.metric("VaR 99%",  f"{v99*100:.2f}%",  delta=f"${v99*S0:.2f}",  delta_color="inverse", help=f"95% bootstrap CI {pct(rn.var_ci[:,1])}")
+    m4.metric("CVaR 99%", f"{cv99*100:.2f}%", delta=f"${cv99*S0:.2f}", delta_color="inverse", help=f"95% bootstrap CI {pct(rn.cvar_ci[:,1])}")
+
+    st.markdown("<div style='height:16px'></div>", unsafe_allow_html=True)
+
+    # likelihood-ratio weighted tail of the IS draws, CIs side by side with naive's
+    w1,w2,w3,w4 = st.columns(4)
+    for col,(lbl,est,ci,nci) in zip((w1,w2,w3,w4), (
+            ("IS VaR 95%", ri.var[0], ri.var_ci[:,0], rn.var_ci[:,0]), ("IS CVaR 95%", ri.cvar[0], ri.cvar_ci[:,0], rn.cvar_ci[:,0]),
+            ("IS VaR 99%", ri.var[1], ri.var_ci[:,1], rn.var_ci[:,1]), ("IS CVaR 99%", ri.cvar[1], ri.cvar_ci[:,1], rn.cvar_ci[:,1]))):
+        # NaN: the shifted draws carry too little weight above K to reach this level
+        card(col, lbl, f"{est*100:.2f}%" if np.isfinite(est) else "n/a",
+             f"CI {pct(ci)} | naive {pct(nci)} | n={ri.n:,}", "#00b4d8")
+
+    st.markdown("<div style='height:16px'></div>", unsafe_allow_html=True)
+
+    # path-dependent crash: price touches K at any time before T
+    b1,b2,b3,b4 = st.columns(4)
+    card(b1,"Analytical P(touch)",f"{touch:.6f}",      "GBM First-Passage Closed Form","#ff3b5c")
+    card(b2,"Barrier MC (Bridge)",f"{bm['p']:.6f}",    f"±{bm['se']:.6f} | err {err_b:.2f}%","#f0b429")
+    card(b3,"Discrete Monitoring",f"{bm['p_discrete']:.6f}",f"{bm['steps']} steps, no bridge | N={bm['n']:,}","#7a9ab0")
+    card(b4,"Touch / Terminal",   f"{touch/true_prob:.2f}×" if true_prob else "—","P(touch) vs P(ST<K)","#a855f7")
+
+    # ═══ SENSITIVITIES ════════════════════════════════════════════════════════
+    section("""<svg width="16" height="16" viewBox="0 0 16 16" fill="none">
+      <path d="M1 13C5 13 6 3 10 3S15 8 15 8" stroke="#00ff87" stroke-width="1.2" fill="none"/>
+      <line x1="4" y1="12" x2="12" y2="4" stroke="#00ff87" stroke-width=".8" stroke-dasharray="2,2"/>
+    </svg>""", "Crash Sensitivities", "#00ff87")
+
+    # every estimator replays the run's own draws (common random numbers), so
+    # the three columns differ by estimator variance, not by fresh noise
+    pm = lambda m,se: f"{m:+.6f} ± {se:.6f}"
+    st.dataframe(pd.DataFrame([
+        {"Draws": g.method.upper(), "∂P/∂": row["param"], "Analytic": f"{row['analytic']:+.6f}",
+         "Likelihood Ratio": pm(row["lr"],row["lr_se"]), "Smoothed Pathwise": pm(row["smooth"],row["smooth_se"]),
+         f"CRN Bump ±{g.delta:.0%}": pm(row["bump"],row["bump_se"])}
+        for g in (gn,gi) for row in g.table()]), hide_index=True, use_container_width=True)
+    st.caption(f"N={gn.n:,} draws per method · kernel bandwidth h={gn.h:.3f} · ± is one standard error")
 
     # ═══ CONVERGENCE ══════════════════════════════════════════════════════════
     section("""<svg width="16" height="16" viewBox="0 0 16 16" fill="none">
       <polyline points="1,13 4,8 7,10 10,4 13,6 15,3" stroke="#00b4d8" stroke-width="1.5" stroke-linecap="round" stroke-linejoin="round"/>
     </svg>""", "Convergence Analysis", "#00b4d8")
 
-    nc = np.cumsum(np_tr)/np.arange(1,N_sims+1)
-    ic = np.cumsum(is_tr)/np.arange(1,N_sims+1)
-    fc = go.Figure()
-    fc.add_trace(go.Scatter(y=nc, mode="lines", name="Naive MC",          line=dict(color="#f0b429",width=1.5)))
-    fc.add_trace(go.Scatter(y=ic, mode="lines", name="Importance Sampling",line=dict(color="#00b4d8",width=1.5)))
-    fc.add_trace(go.Scatter(y=[true_prob]*N_sims, mode="lines", name="Analytical Truth",line=dict(color="#00ff87",width=2,dash="dot")))
-    if show_confidence:
-        ns = np.array([np.std(np_tr[:i+1])/np.sqrt(i+1) for i in range(N_sims)])
-        fc.add_trace(go.Scatter(y=nc+1.96*ns, mode="lines", line=dict(width=0), showlegend=False, hoverinfo="skip"))
-        fc.add_trace(go.Scatter(y=nc-1.96*ns, mode="lines", line=dict(width=0),
-            fillcolor="rgba(240,180,41,.08)", fill="tonexty", name="95% CI (Naive)", hoverinfo="skip"))
-    fc.update_layout(height=420, title="Probability Estimate Convergence",
-        xaxis_title="Iterations", yaxis_title="P(crash)", hovermode="x unified", **PT)
-    st.plotly_chart(fc, use_container_width=True)
+    # per-draw bands over the retained prefix, chunk-boundary checkpoints beyond it
+    with tel.stage("convergence_bands") as rec:
+        (nc,ic),(ns,iss),_,_ = running_bands(np.vstack([np_tr,is_tr]))
+        tail = nm.trace[:,0] > len(np_tr)
+        xs   = np.concatenate([np.arange(1,len(np_tr)+1), nm.trace[tail,0]])
+        nc,ns  = np.concatenate([nc,nm.trace[tail,1]]), np.concatenate([ns,nm.trace[tail,2]])
+        ic,iss = np.concatenate([ic,im.trace[tail,1]]), np.concatenate([iss,im.trace[tail,2]])
+        ix   = log_index(xs)
+        xs,nc,ns,ic,iss = xs[ix],nc[ix],ns[ix],ic[ix],iss[ix]
+        rec["arrays"] = array_info(tr=np.vstack([np_tr,is_tr]), xs=xs)
+    with tel.stage("chart/convergence", points=len(xs)):
+        fc = go.Figure()
+        fc.add_trace(go.Scatter(x=xs, y=nc, mode="lines", name="Naive MC",          line=dict(color="#f0b429",width=1.5)))
+        fc.add_trace(go.Scatter(x=xs, y=ic, mode="lines", name="Importance Sampling",line=dict(color="#00b4d8",width=1.5)))
+        fc.add_hline(y=true_prob, line=dict(color="#00ff87",width=2,dash="dot"),
+            annotation_text="Analytical Truth", annotation_font_color="#00ff87")
+        if show_confidence:
+            fc.add_trace(go.Scatter(x=xs, y=nc+1.96*ns, mode="lines", line=dict(width=0), showlegend=False, hoverinfo="skip"))
+            fc.add_trace(go.Scatter(x=xs, y=nc-1.96*ns, mode="lines", line=dict(width=0),
+                fillcolor="rgba(240,180,41,.08)", fill="tonexty", name="95% CI (Naive)", hoverinfo="skip"))
+            fc.add_trace(go.Scatter(x=xs, y=ic+1.96*iss, mode="lines", line=dict(width=0), showlegend=False, hoverinfo="skip"))
+            fc.add_trace(go.Scatter(x=xs, y=ic-1.96*iss, mode="lines", line=dict(width=0),
+                fillcolor="rgba(0,180,216,.08)", fill="tonexty", name="95% CI (IS)", hoverinfo="skip"))
+        fc.update_layout(height=420, title="Probability Estimate Convergence",
+            xaxis_title="Iterations", yaxis_title="P(crash)", hovermode="x unified", **PT)
+        st.plotly_chart(fc, use_container_width=True)
 
     # ═══ DISTRIBUTIONS ════════════════════════════════════════════════════════
     section("""<svg width="16" height="16" viewBox="0 0 16 16" fill="none">
@@ -353,29 +655,28 @@ if st.button("▶  RUN ADVANCED SIMULATION", use_container_width=True):
       <line x1="8" y1="2" x2="8" y2="13" stroke="#a855f7" stroke-width=".8" stroke-dasharray="2,2"/>
     </svg>""", "Distribution Analysis", "#a855f7")
 
-    dc1,dc2 = st.columns(2)
-    with dc1:
-        fd = go.Figure()
-        fd.add_trace(go.Histogram(x=np_ST, name="Naive MC", opacity=.6,
-            marker_color="#f0b429", nbinsx=60, histnorm="probability density"))
-        fd.add_trace(go.Histogram(x=is_ST, name="Importance Sampling", opacity=.6,
-            marker_color="#00b4d8", nbinsx=60, histnorm="probability density"))
-        fd.add_vline(x=K, line_dash="dash", line_color="#ff3b5c",
-            annotation_text=f"K={K:.0f}", annotation_font_color="#ff3b5c", annotation_position="top right")
-        fd.update_layout(height=380, title="Terminal Price Distributions",
-            xaxis_title="Price ($)", yaxis_title="Density", barmode="overlay", **PT)
-        st.plotly_chart(fd, use_container_width=True)
-    with dc2:
-        fr = go.Figure()
-        fr.add_trace(go.Histogram(x=np_ret*100, name="Returns", opacity=.8,
-            marker_color="#00ff87", nbinsx=60, histnorm="probability density"))
-        fr.add_vline(x=v95*100, line_dash="dash", line_color="#f0b429",
-            annotation_text="VaR95", annotation_font_color="#f0b429")
-        fr.add_vline(x=v99*100, line_dash="dash", line_color="#ff3b5c",
-            annotation_text="VaR99", annotation_font_color="#ff3b5c")
-        fr.update_layout(height=380, title="Returns Distribution + VaR Thresholds",
-            xaxis_title="Return (%)", yaxis_title="Density", **PT)
-        st.plotly_chart(fr, use_container_width=True)
+    with tel.stage("chart/distribution"):
+        dc1,dc2 = st.columns(2)
+        with dc1:
+            fd = go.Figure()
+            e = edges(np_ST, is_ST)
+            fd.add_trace(density_bar(np_ST, e, name="Naive MC", opacity=.6, marker_color="#f0b429"))
+            fd.add_trace(density_bar(is_ST, e, name="Importance Sampling", opacity=.6, marker_color="#00b4d8"))
+            fd.add_vline(x=K, line_dash="dash", line_color="#ff3b5c",
+                annotation_text=f"K={K:.0f}", annotation_font_color="#ff3b5c", annotation_position="top right")
+            fd.update_layout(height=380, title="Terminal Price Distributions",
+                xaxis_title="Price ($)", yaxis_title="Density", barmode="overlay", **PT)
+            st.plotly_chart(fd, use_container_width=True)
+        with dc2:
+            fr = go.Figure()
+            fr.add_trace(density_bar(np_ret*100, edges(np_ret*100), name="Returns", opacity=.8, marker_color="#00ff87"))
+            fr.add_vline(x=v95*100, line_dash="dash", line_color="#f0b429",
+                annotation_text="VaR95", annotation_font_color="#f0b429")
+            fr.add_vline(x=v99*100, line_dash="dash", line_color="#ff3b5c",
+                annotation_text="VaR99", annotation_font_color="#ff3b5c")
+            fr.update_layout(height=380, title="Returns Distribution + VaR Thresholds",
+                xaxis_title="Return (%)", yaxis_title="Density", **PT)
+            st.plotly_chart(fr, use_container_width=True)
 
     # ═══ PATH SIMULATION ══════════════════════════════════════════════════════
     section("""<svg width="16" height="16" viewBox="0 0 16 16" fill="none">
@@ -383,31 +684,31 @@ if st.button("▶  RUN ADVANCED SIMULATION", use_container_width=True):
       <path d="M1 12 C4 9,6 11,8 8 C10 5,12 10,15 8" stroke="#f0b429" stroke-width="1" fill="none" stroke-linecap="round" opacity=".6"/>
     </svg>""", "Stochastic Path Simulation", "#00ff87")
 
-    steps = int(252*T);  tg = np.linspace(0,T,steps+1)
-    Zp    = np.random.normal(0,1,(path_count,steps))
-    Wt    = np.cumsum(np.hstack([np.zeros((path_count,1)),Zp]),axis=1)*np.sqrt(T/252)
-    Sn    = S0*np.exp((r-.5*sigma**2)*tg+sigma*Wt)
-    mu_is = (np.log(K/S0)-(r-.5*sigma**2)*T)/(sigma*np.sqrt(T))-.5
-    Zpb   = np.random.normal(0,1,(path_count,steps))+mu_is/np.sqrt(T)*np.sqrt(T/252)
-    Wtb   = np.cumsum(np.hstack([np.zeros((path_count,1)),Zpb]),axis=1)*np.sqrt(T/252)
-    Sb    = S0*np.exp((r-.5*sigma**2)*tg+sigma*Wtb)
-
-    fp = go.Figure()
-    for i in range(path_count):
-        fp.add_trace(go.Scatter(x=tg,y=Sn[i],mode="lines",
-            line=dict(color="rgba(0,180,216,.18)",width=1),showlegend=False,hoverinfo="skip"))
-    for i in range(path_count):
-        fp.add_trace(go.Scatter(x=tg,y=Sb[i],mode="lines",
-            line=dict(color="rgba(240,180,41,.18)",width=1),showlegend=False,hoverinfo="skip"))
-    fp.add_trace(go.Scatter(x=tg,y=[K]*len(tg),mode="lines",
-        name=f"Crash Level ${K:.0f}",line=dict(color="#ff3b5c",width=2,dash="dash")))
-    fp.add_trace(go.Scatter(x=[None],y=[None],mode="lines",
-        line=dict(color="rgba(0,180,216,.7)",width=2),name="Naive Paths (GBM)"))
-    fp.add_trace(go.Scatter(x=[None],y=[None],mode="lines",
-        line=dict(color="rgba(240,180,41,.7)",width=2),name="IS Paths (Stress-Biased)"))
-    fp.update_layout(height=550,title=f"GBM Price Paths — N={path_count} simulations",
-        xaxis_title="Time (Years)",yaxis_title="Price ($)",**PT)
-    st.plotly_chart(fp, use_container_width=True)
+    # the fan's size depends only on the time grid, so it can summarise far more paths
+    n_paths  = FAN_PATHS if path_mode=="Quantile Fan" else path_count
+    sampler  = "sobol" if path_sampler=="Sobol QMC" else "pseudo"
+    # float32 is ample for plotting and halves the cached path matrices
+    tg,Sn,Sb = staged("paths", result_key(S0,K,T,r,sigma,n_paths,seed,"paths",sampler=sampler,dtype="float32"),
+                   gbm_paths, (S0,K,T,r,sigma,n_paths,np.random.default_rng([seed,2]),sampler,np.float32))
+
+    with tel.stage("chart/paths", mode=path_mode):
+        fp = go.Figure()
+        if path_mode=="Quantile Fan":
+            fp.add_traces(fan_traces(tg,Sn,"0,180,216","Naive (GBM)"))
+            fp.add_traces(fan_traces(tg,Sb,"240,180,41","IS (Stress-Biased)"))
+        else:
+            fp.add_trace(path_trace(tg,Sn,line=dict(color="rgba(0,180,216,.18)",width=1),showlegend=False,hoverinfo="skip"))
+            fp.add_trace(path_trace(tg,Sb,line=dict(color="rgba(240,180,41,.18)",width=1),showlegend=False,hoverinfo="skip"))
+            fp.add_trace(go.Scatter(x=[None],y=[None],mode="lines",
+                line=dict(color="rgba(0,180,216,.7)",width=2),name="Naive Paths (GBM)"))
+            fp.add_trace(go.Scatter(x=[None],y=[None],mode="lines",
+                line=dict(color="rgba(240,180,41,.7)",width=2),name="IS Paths (Stress-Biased)"))
+        fp.add_hline(y=K, line=dict(color="#ff3b5c",width=2,dash="dash"),
+            annotation_text=f"Crash Level ${K:.0f}", annotation_font_color="#ff3b5c")
+        fp.update_layout(height=550,title=f"GBM Price Paths — N={n_paths:,} simulations"
+                         +(" (5/25/50/75/95% fan)" if path_mode=="Quantile Fan" else ""),
+            xaxis_title="Time (Years)",yaxis_title="Price ($)",**PT)
+        st.plotly_chart(fp, use_container_width=True)
 
     # ═══ HISTORICAL DATA ══════════════════════════════════════════════════════
     if "hist" in st.session_state:
@@ -456,6 +757,7 @@ if st.button("▶  RUN ADVANCED SIMULATION", use_container_width=True):
     rgba = "255,59,92" if true_prob>.20 else ("240,180,41" if true_prob>.10 else "0,255,135")
 
     sc1,sc2 = st.columns(2)
+    tel_slot = st.container()     # Engine Telemetry — filled once every stage has run
     with sc1:
         st.markdown(f"""
         <div class="sum-table">
@@ -466,10 +768,12 @@ if st.button("▶  RUN ADVANCED SIMULATION", use_container_width=True):
             <tr><td style="color:#7a9ab0;">Crash Level</td><td style="color:#ff3b5c;text-align:right;">${K:.2f} ({crash_pct}%)</td></tr>
             <tr><td style="color:#7a9ab0;">Horizon</td>    <td style="color:#e8f4f8;text-align:right;">{T}Y</td></tr>
             <tr><td style="color:#7a9ab0;">Simulations</td><td style="color:#e8f4f8;text-align:right;">{N_sims:,}</td></tr>
+            <tr><td style="color:#7a9ab0;">Seed</td>       <td style="color:#e8f4f8;text-align:right;">{int(seed)}</td></tr>
             <tr><td style="color:#7a9ab0;padding-top:8px;border-top:1px solid #1a2e3d;">Analytical P</td>
                 <td style="color:#00ff87;text-align:right;font-weight:700;padding-top:8px;border-top:1px solid #1a2e3d;">{true_prob:.6f}</td></tr>
             <tr><td style="color:#7a9ab0;">Naive MC</td>   <td style="color:#f0b429;text-align:right;">{np_p:.6f} ±{np_se:.6f}</td></tr>
             <tr><td style="color:#7a9ab0;">IS Estimate</td><td style="color:#00b4d8;text-align:right;">{is_p:.6f} ±{is_se:.6f}</td></tr>
+            <tr><td style="color:#7a9ab0;">Barrier MC</td> <td style="color:#ff3b5c;text-align:right;">{bm["p"]:.6f} ±{bm["se"]:.6f}</td></tr>
             <tr><td style="color:#7a9ab0;">Var Reduction</td><td style="color:#a855f7;text-align:right;">{vr:.2f}×</td></tr>
           </table>
         </div>""", unsafe_allow_html=True)
@@ -507,19 +811,145 @@ if st.button("▶  RUN ADVANCED SIMULATION", use_container_width=True):
 
     # ═══ EXPORT ═══════════════════════════════════════════════════════════════
     st.markdown("<div style='height:24px'></div>", unsafe_allow_html=True)
-    df_out = pd.DataFrame({
-        "Simulation":range(1,N_sims+1),
-        "Naive_Price":np_ST,"IS_Price":is_ST,
-        "Naive_Returns":np_ret,"IS_Returns":is_ret,
-        "Naive_Crash":np_tr,"IS_Crash":is_tr
-    })
-    st.download_button(
-        label="↓  EXPORT SIMULATION DATA  (.CSV)",
-        data=df_out.to_csv(index=False),
-        file_name=f"quantedge_{ticker}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-        mime="text/csv",
-        use_container_width=True
-    )
+    # nothing is formatted until the button is clicked; per-draw rows cover the
+    # retained prefix (all draws when N ≤ engine KEEP)
+    ec1,ec2,ec3 = st.columns([2,1,1])
+    with ec2: ex_fmt  = st.selectbox("Format", list(EXPORT_FORMATS), format_func=str.upper, label_visibility="collapsed")
+    with ec3: ex_what = st.radio("Rows", ["Per-draw","Summary"], horizontal=True, label_visibility="collapsed")
+    ex_f32 = ex_what=="Per-draw" and st.checkbox("float32 columns (half the size)", value=False)
+    summary_rows = [
+        dict(method="analytic", p=true_prob, se=0., n=None),
+        *(dict(method=m, p=res.p, se=res.se, n=res.n, seconds=res.elapsed)
+          for m,res in (("naive",nm),("is",im),("qmc-naive",qn),("qmc-is",qi),("adaptive",am))),
+        dict(method="barrier", p=bm["p"], se=bm["se"], n=bm["n"]),
+        *(dict(method=f"var-cvar-{m}", **{f"{k}{int(c*100)}{b}": v for i,c in enumerate(rk.levels)
+            for k,est,ci in (("var",rk.var,rk.var_ci),("cvar",rk.cvar,rk.cvar_ci))
+            for b,v in (("",est[i]),("_lo",ci[0,i]),("_hi",ci[1,i]))})
+          for m,rk in (("naive",rn),("is",ri))),
+    ]
+
+    def export_data():
+        with tel.stage("export", fmt=ex_fmt, rows=ex_what, float32=ex_f32) as rec:
+            cols = draw_columns(nm, im, ex_f32) if ex_what=="Per-draw" else summary_columns(summary_rows)
+            data = export_bytes(cols, ex_fmt)
+            rec["mb"] = len(data)/2**20
+        return data
+
+    ext,mime = EXPORT_FORMATS[ex_fmt]
+    with ec1:
+        st.download_button(
+            label=f"↓  EXPORT {'SIMULATION DATA' if ex_what=='Per-draw' else 'SUMMARY'}  (.{ext.upper()})",
+            data=export_data,
+            file_name=f"quantedge_{ticker}_{'draws' if ex_what=='Per-draw' else 'summary'}"
+                      f"_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{ext}",
+            mime=mime, on_click="ignore",
+            use_container_width=True
+        )
+
+    with tel_slot:
+        runs  = [t for t in (st.session_state.get("fetch_telemetry"),
+                             st.session_state.get("job_telemetry")) if t]+[tel]
+        with st.expander(f"◈ Engine Telemetry — {tel.total_s*1e3:,.0f} ms over {len(tel.records)} stages"):
+            st.dataframe(pd.DataFrame([row for t in runs for row in t.table()]),
+                         hide_index=True, use_container_width=True)
+            st.download_button("↓  TELEMETRY  (.JSONL)", data="".join(t.to_jsonl() for t in runs),
+                file_name=f"quantedge_telemetry_{tel.id}.jsonl", mime="application/x-ndjson")
+
+# ═══ PORTFOLIO ════════════════════════════════════════════════════════════════
+if "portfolio" in st.session_state:
+    pf  = st.session_state["portfolio"]
+    pr  = pf["res"]
+    section("""<svg width="16" height="16" viewBox="0 0 16 16" fill="none">
+      <rect x="1" y="8" width="3.5" height="7" fill="#00ff87" rx=".5"/>
+      <rect x="6.25" y="5" width="3.5" height="10" fill="#00b4d8" rx=".5"/>
+      <rect x="11.5" y="1" width="3.5" height="14" fill="#a855f7" rx=".5"/>
+    </svg>""", "Portfolio Risk", "#00ff87")
+
+    pv95,pcv95 = pr.var_cvar(.95)
+    pv99,pcv99 = pr.var_cvar(.99)
+    p1,p2,p3,p4 = st.columns(4)
+    card(p1,f"P(loss > {pr.threshold:.0%})",f"{pr.p:.6f}",f"±{pr.se:.6f} | {pf['T']}Y horizon","#ff3b5c")
+    card(p2,"Portfolio VaR / CVaR 95%",f"{pv95*100:.2f}%",f"CVaR {pcv95*100:.2f}%","#f0b429")
+    card(p3,"Portfolio VaR / CVaR 99%",f"{pv99*100:.2f}%",f"CVaR {pcv99*100:.2f}%","#f0b429")
+    card(p4,"Scenarios × Assets",f"{pr.n:,} × {len(pr.tickers)}",
+         f"{pr.elapsed:.2f}s | {pf['days']} days | shrinkage {pr.shrink:.2f}","#a855f7")
+
+    vol = np.sqrt(np.diag(pf["cov"]))
+    pc1,pc2 = st.columns(2)
+    with pc1:
+        st.dataframe(pd.DataFrame({"Ticker":pr.tickers,"Weight":pr.weights,"Volatility σ":vol}),
+                     hide_index=True, use_container_width=True)
+    with pc2:
+        if len(pr.tickers) <= 60:
+            fcor = go.Figure(go.Heatmap(z=pf["cov"]/np.outer(vol,vol), x=pr.tickers, y=pr.tickers,
+                zmin=-1, zmax=1, colorscale="RdBu_r"))
+            fcor.update_layout(height=400, title="Return Correlation (after shrinkage)", **PT)
+            st.plotly_chart(fcor, use_container_width=True)
+
+# ═══ PARAMETER SWEEP ══════════════════════════════════════════════════════════
+if "sweep" in st.session_state:
+    sw = st.session_state["sweep"]
+    section("""<svg width="16" height="16" viewBox="0 0 16 16" fill="none">
+      <rect x="1" y="1" width="6" height="6" fill="#a855f7" opacity=".9"/>
+      <rect x="9" y="1" width="6" height="6" fill="#a855f7" opacity=".5"/>
+      <rect x="1" y="9" width="6" height="6" fill="#a855f7" opacity=".3"/>
+      <rect x="9" y="9" width="6" height="6" fill="#a855f7" opacity=".7"/>
+    </svg>""", "Crash-Probability Surface", "#a855f7")
+
+    st.caption(f"{sw.analytic.size:,} grid points · {sw.n:,} common random numbers · {sw.elapsed:.2f}s")
+    vi  = st.select_slider("Volatility slice σ", options=list(range(len(sw.vols))),
+                           value=int(np.argmin(abs(sw.vols-sigma))), format_func=lambda i: f"{sw.vols[i]:.3f}")
+    layers = {"Analytical":sw.analytic, "Naive MC":sw.naive, "Importance Sampling":sw.is_,
+              "IS − Analytical (σ units)":(sw.is_-sw.analytic)/np.where(sw.is_se>0,sw.is_se,np.nan)}
+    sv1,sv2 = st.columns(2)
+    with sv1:
+        for tab,(name,z) in zip(st.tabs(list(layers)), layers.items()):
+            with tab:
+                fsw = go.Figure(go.Heatmap(z=z[:,:,vi], x=sw.horizons, y=sw.crash*100,
+                    colorscale="RdBu_r" if "σ units" in name else "Inferno",
+                    zmid=0 if "σ units" in name else None, colorbar=dict(title="")))
+                fsw.update_layout(height=420, title=f"{name} — σ={sw.vols[vi]:.3f}",
+                    xaxis_title="Horizon (Years)", yaxis_title="Crash Threshold (%)", **PT)
+                st.plotly_chart(fsw, use_container_width=True)
+    with sv2:
+        fss = go.Figure(go.Surface(z=sw.analytic[:,:,vi], x=sw.horizons, y=sw.crash*100,
+            colorscale="Inferno", opacity=.85, showscale=False, name="Analytical"))
+        fss.add_trace(go.Scatter3d(x=np.broadcast_to(sw.horizons,sw.is_[:,:,vi].shape).ravel(),
+            y=np.broadcast_to(sw.crash[:,None]*100,sw.is_[:,:,vi].shape).ravel(),
+            z=sw.is_[:,:,vi].ravel(), mode="markers", marker=dict(size=2,color="#00b4d8"), name="IS MC"))
+        fss.update_layout(height=480, title="Analytical Surface + IS MC Points",
+            scene=dict(xaxis_title="Horizon", yaxis_title="Crash %", zaxis_title="P(crash)"),
+            **{k:v for k,v in PT.items() if k not in ("xaxis","yaxis")})
+        st.plotly_chart(fss, use_container_width=True)
+
+# ═══ UNIVERSE SCREEN ══════════════════════════════════════════════════════════
+if "screen" in st.session_state:
+    sr = st.session_state["screen"]
+    section("""<svg width="16" height="16" viewBox="0 0 16 16" fill="none">
+      <line x1="1" y1="3" x2="15" y2="3" stroke="#ff3b5c" stroke-width="1.5"/>
+      <line x1="1" y1="8" x2="11" y2="8" stroke="#ff3b5c" stroke-width="1.5" opacity=".7"/>
+      <line x1="1" y1="13" x2="6" y2="13" stroke="#ff3b5c" stroke-width="1.5" opacity=".4"/>
+    </svg>""", "Universe Screen", "#ff3b5c")
+
+    df_sc = sr.frame()
+    top   = df_sc.iloc[0]
+    u1,u2,u3,u4 = st.columns(4)
+    card(u1,"Names Screened",  f"{len(sr.tickers):,}", f"{len(sr.errors)} failed | {sr.elapsed:.2f}s","#00ff87")
+    card(u2,"Highest P(crash)",f"{top[f'P {sr.estimator}']:.4f}", f"{top['Ticker']} · σ {top[f'σ {sr.estimator}']:.3f}","#ff3b5c")
+    card(u3,"Median P(crash)", f"{np.nanmedian(sr.analytic[:,SCREEN_ESTIMATORS.index(sr.estimator)]):.4f}",
+         f"{sr.crash:.0%} of price within {sr.T:g}y","#f0b429")
+    card(u4,"MC-Refined Tail", f"{int(sr.flagged.sum())}",
+         f"bootstrap / analytic {np.nanmedian(df_sc['MC / analytic']):.2f}× median" if sr.flagged.any() else "—","#a855f7")
+    st.markdown("<div style='height:16px'></div>", unsafe_allow_html=True)
+
+    # click any header to re-sort; default order is the selected estimator's P(crash)
+    num = st.column_config.NumberColumn
+    st.dataframe(df_sc, hide_index=True, use_container_width=True, height=min(36*len(df_sc)+38, 640),
+        column_config={"Price": num(format="$%.2f"),
+                       **{c: num(format="%.4f") for c in df_sc.columns if c.startswith(("σ ","P ","MC"))},
+                       "Skew": num(format="%.3f"), "Ex. Kurtosis": num(format="%.2f")})
+    for t, e in sr.errors.items():
+        st.warning(f"{t}: {e}")
 
 # ─── FOOTER ───────────────────────────────────────────────────────────────────
 st.markdown("""
@@ -0,0 +1,194 @@
+"""Timing / memory benchmarks for the Monte Carlo engine, path generator and charts.
+
+    python bench.py run [--quick] [-o report.json]     full suite, offline
+    python bench.py compare base.json new.json         flag regressions
+    python bench.py scaling [--N 10000000]             process-pool scaling
+
+Market data comes from the stored fixtures/ directory through FileSource, never
+from Yahoo Finance, so reports from different machines and commits are comparable."""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+from quantedge.engine import is_mc, naive_mc, running_bands, simulate, var_cvar
+
+BASE     = dict(S0=100., K=70., T=1., r=.05, sigma=.2)
+FIXTURES = Path(__file__).parent/"fixtures"
+TICKER   = "BENCH"
+
+
+# ─── HARNESS ──────────────────────────────────────────────────────────────────
+def measure(fn, repeat=5, budget=2.):
+    # median/min wall time over up to `repeat` calls (fewer once `budget` seconds
+    # are spent), then one traced call for peak Python/numpy allocation
+    times = []
+    while len(times) < repeat and (len(times) < 1 or sum(times) < budget):
+        t0 = time.perf_counter(); fn(); times.append(time.perf_counter()-t0)
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {"median_s": statistics.median(times), "min_s": min(times), "runs": len(times),
+            "peak_mb": peak/2**20}
+
+
+def cases(quick):
+    import plotly.graph_objects as go
+    from quantedge.data import FileSource, PriceCache, return_stats
+    from quantedge.export import FORMATS, draw_columns, to_bytes
+    from quantedge.paths import gbm_paths, gbm_stats
+    from quantedge.risk import tail_risk
+    from quantedge.render import density_bar, edges, fan_traces, log_index, path_trace
+
+    Ns    = [10**k for k in range(3, 6 if quick else 8)]
+    rng   = np.random.default_rng(0)
+    out   = {}
+    for N in Ns:
+        out[f"naive_mc/N={N:.0e}"] = lambda N=N: naive_mc(**BASE, N=N, rng=rng)
+        out[f"is_mc/N={N:.0e}"]    = lambda N=N: is_mc(**BASE, N=N, rng=rng)
+        ret = (naive_mc(**BASE, N=N, rng=rng)[2]-BASE["S0"])/BASE["S0"]
+        out[f"var_cvar/N={N:.0e}"] = lambda ret=ret: (var_cvar(ret, .95), var_cvar(ret, .99))
+        out[f"simulate/naive/N={N:.0e}"] = lambda N=N: simulate(**BASE, N=N, method="naive", seed=1)
+        out[f"simulate/is/N={N:.0e}"]    = lambda N=N: simulate(**BASE, N=N, method="is", seed=1)
+
+    for T in (1., 5.):
+        sizes = (50, 200) if quick else (50, 200, 500, 2000)
+        for n in sizes:
+            out[f"gbm_paths/T={T:g}/paths={n}"] = lambda T=T, n=n: gbm_paths(
+                BASE["S0"], BASE["K"], T, BASE["r"], BASE["sigma"], n, np.random.default_rng(2))
+        n = sizes[-1]
+        out[f"gbm_paths/f32/T={T:g}/paths={n}"] = lambda T=T, n=n: gbm_paths(
+                BASE["S0"], BASE["K"], T, BASE["r"], BASE["sigma"], n, np.random.default_rng(2), dtype=np.float32)
+        out[f"gbm_stats/T={T:g}/paths={100*n}"] = lambda T=T, n=n: gbm_stats(
+                BASE["S0"], BASE["K"], T, BASE["r"], BASE["sigma"], 100*n, int(252*T), np.random.default_rng(2))
+
+    for N in Ns[:4]:
+        tr = naive_mc(**BASE, N=N, rng=rng)[3]
+        out[f"running_bands/N={N:.0e}"] = lambda tr=tr: running_bands(np.vstack([tr, tr]))
+
+    # figure build + JSON serialisation, i.e. what Streamlit ships to the browser
+    N = 20000
+    nm, im = simulate(**BASE, N=N, method="naive", seed=1), simulate(**BASE, N=N, method="is", seed=1)
+    def fig_convergence():
+        (nc, ic), (ns, iss), _, _ = running_bands(np.vstack([nm.tr, im.tr]))
+        ix = log_index(np.arange(1, N+1))
+        f  = go.Figure([go.Scatter(y=y[ix], x=ix+1) for y in (nc, ic, nc+1.96*ns, nc-1.96*ns)])
+        return f.to_json()
+    def fig_distribution():
+        e = edges(nm.ST, im.ST)
+        return go.Figure([density_bar(nm.ST, e), density_bar(im.ST, e), density_bar(nm.ret, edges(nm.ret))]).to_json()
+    tg, Sn, Sb = gbm_paths(**BASE, n=200, rng=np.random.default_rng(3))
+    tf, Fn, Fb = gbm_paths(**BASE, n=2000, rng=np.random.default_rng(3))
+    out["figure/convergence"]  = fig_convergence
+    out["figure/distribution"] = fig_distribution
+    out["figure/paths=200"]    = lambda: go.Figure([path_trace(tg, Sn), path_trace(tg, Sb)]).to_json()
+    out["figure/fan=2000"]     = lambda: go.Figure(fan_traces(tf, Fn, "0,0,0", "n")+fan_traces(tf, Fb, "0,0,0", "b")).to_json()
+
+    # the download the app builds: per-draw columns serialised to each format
+    for fmt in FORMATS:
+        for f32 in (False, True):
+            out[f"export/{fmt}{'/f32' if f32 else ''}/N=2e+04"] = (
+                lambda fmt=fmt, f32=f32: to_bytes(draw_columns(nm, im, f32), fmt))
+    out["tail_risk/levels=2/N=2e+04"]      = lambda: tail_risk(nm.ret, B=0)
+    out["tail_risk/boot=1000/N=2e+04"]     = lambda: tail_risk(nm.ret, seed=1)
+
+    src = FileSource(FIXTURES)
+    tmp = tempfile.mkdtemp(prefix="qe-bench-")
+    out["data/fixture_read"]  = lambda: src.history(TICKER, "5y")
+    out["data/return_stats"]  = lambda: return_stats(src.history(TICKER, "5y"))
+    warm = PriceCache(Path(tmp)/"warm", source=src); warm.load(TICKER, "5y")
+    out["data/cache_hit"]     = lambda: warm.load(TICKER, "5y")
+    out["data/cache_miss"]    = lambda: PriceCache(Path(tmp)/"cold", source=src).load(TICKER, "5y", refresh=True)
+    return out
+
+
+def meta():
+    try:
+        rev = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                             cwd=Path(__file__).parent).stdout.strip()
+    except OSError:
+        rev = ""
+    return {"commit": rev, "python": platform.python_version(), "numpy": np.__version__,
+            "machine": platform.machine(), "cpus": os.cpu_count(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S")}
+
+
+# ─── COMMANDS ─────────────────────────────────────────────────────────────────
+def run(quick, output, match):
+    report = {"meta": meta(), "results": {}}
+    for name, fn in cases(quick).items():
+        if match and match not in name:
+            continue
+        r = measure(fn)
+        report["results"][name] = r
+        print(f"{name:<34} {r['median_s']*1e3:>10.2f} ms  (min {r['min_s']*1e3:.2f}, ×{r['runs']})"
+              f"  peak {r['peak_mb']:>8.1f} MB", flush=True)
+    if output:
+        Path(output).write_text(json.dumps(report, indent=1))
+        print(f"wrote {output}")
+    return report
+
+
+def compare(base, new, tol):
+    a, b = (json.loads(Path(p).read_text())["results"] for p in (base, new))
+    worse = 0
+    print(f"{'case':<34} {'base ms':>10} {'new ms':>10} {'ratio':>7} {'Δ peak MB':>10}")
+    for k in sorted(a.keys() & b.keys()):
+        ra = b[k]["median_s"]/a[k]["median_s"] if a[k]["median_s"] else float("inf")
+        flag = "  REGRESSION" if ra > tol else ("  faster" if ra < 1/tol else "")
+        worse += ra > tol
+        print(f"{k:<34} {a[k]['median_s']*1e3:>10.2f} {b[k]['median_s']*1e3:>10.2f} {ra:>6.2f}× "
+              f"{b[k]['peak_mb']-a[k]['peak_mb']:>+10.1f}{flag}")
+    for k in sorted(a.keys() ^ b.keys()):
+        print(f"{k:<34} only in {'base' if k in a else 'new'}")
+    return worse
+
+
+def scaling(N, seed):
+    # 1 → all cores; every row must reproduce the single-worker numbers exactly
+    cores = os.cpu_count() or 1
+    ws    = sorted({1, *[w for w in (2, 4, 8, 16, 32, 64) if w < cores], cores})
+    print(f"{'workers':>7} {'method':>6} {'seconds':>8} {'speedup':>7} {'P(crash)':>10} {'se':>10} {'VaR95':>9}")
+    ref = {}
+    for method in ("naive", "is"):
+        for w in ws:
+            t0  = time.perf_counter()
+            res = simulate(**BASE, N=N, method=method, seed=seed, workers=w)
+            dt  = time.perf_counter()-t0
+            row = (res.p, res.se, res.var_cvar(.95)[0])
+            ref.setdefault(method, (dt, row))
+            same = "" if row == ref[method][1] else "  MISMATCH"
+            print(f"{w:>7} {method:>6} {dt:>8.3f} {ref[method][0]/dt:>6.2f}× "
+                  f"{row[0]:>10.6f} {row[1]:>10.2e} {row[2]*100:>8.3f}%{same}")
+
+
+if __name__ == "__main__":
+    ap  = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    sp  = sub.add_parser("run", help="run the benchmark suite")
+    sp.add_argument("--quick", action="store_true", help="cap N at 1e5 and skip the largest path sets")
+    sp.add_argument("-o", "--output", help="write the JSON report here")
+    sp.add_argument("-k", "--match", help="only cases whose name contains this")
+    sp  = sub.add_parser("compare", help="compare two JSON reports")
+    sp.add_argument("base"); sp.add_argument("new")
+    sp.add_argument("--tol", type=float, default=1.25, help="slowdown ratio flagged as a regression")
+    sp  = sub.add_parser("scaling", help="process-pool scaling from 1 to all cores")
+    sp.add_argument("--N", type=int, default=10_000_000)
+    sp.add_argument("--seed", type=int, default=42)
+    a = ap.parse_args()
+    if a.cmd == "run":
+        run(a.quick, a.output, a.match)
+    elif a.cmd == "compare":
+        sys.exit(1 if compare(a.base, a.new, a.tol) else 0)
+    elif a.cmd == "scaling":
+        scaling(a.N, a.seed)
@@ -0,0 +1,37 @@
+"""QuantEdge Monte Carlo risk engine — the computational core behind app.py.
+
+Names resolve lazily from their submodules on first access, so ``import quantedge``
+is cheap and never pulls in streamlit, plotly or yfinance (yfinance loads only when
+a YahooSource actually fetches). Chart helpers live in ``quantedge.render``."""
+import importlib
+
+_EXPORTS = {
+    "engine":    ("CHUNK", "KEEP", "MCResult", "Moments", "QuantileSketch", "is_mc", "is_shift",
+                  "naive_mc", "running_bands", "simulate", "var_cvar"),
+    "paths":     ("barrier_mc", "barrier_prob", "gbm_fill", "gbm_paths", "gbm_stats", "gbm_walk"),
+    "qmc":       ("QMCResult", "qmc_mc", "sobol_normals"),
+    "adaptive":  ("AdaptiveResult", "adaptive_is", "ce_shift"),
+    "portfolio": ("PortfolioResult", "align_returns", "covariance", "portfolio_mc"),
+    "greeks":    ("GreeksResult", "analytic_greeks", "greeks", "z_star"),
+    "risk":      ("TailRisk", "bootstrap_var_cvar", "is_weights", "tail_risk", "var_cvar_levels",
+                  "weighted_var_cvar"),
+    "sweep":     ("SweepResult", "crash_z", "sweep_grid"),
+    "screener":  ("ScreenResult", "boot_crash", "ohlc_panel", "screen", "vol_estimates"),
+    "data":      ("FileSource", "PriceCache", "YahooSource", "load_many", "return_stats"),
+    "cache":     ("ResultCache", "result_key"),
+    "jobs":      ("Cancelled", "Job", "JobRunner"),
+}
+_WHERE  = {name: mod for mod, names in _EXPORTS.items() for name in names}
+__all__ = sorted(_WHERE)
+
+
+def __getattr__(name):
+    if name not in _WHERE:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{_WHERE[name]}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
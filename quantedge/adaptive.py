@@ -0,0 +1,85 @@
+"""Adaptive importance sampling: cross-entropy drift tuning and stop-at-precision runs."""
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+from .engine import _STREAM, CHUNK, Moments, is_mc
+
+PILOT = 10_000       # draws per cross-entropy iteration
+RHO   = .1           # elite fraction per CE level
+BATCH = CHUNK
+MAX_N = 100_000_000
+
+
+def ce_shift(S0, K, T, r, sigma, n=PILOT, rho=RHO, iters=20, rng=None):
+    """Cross-entropy optimal mean shift μ* for Z ~ N(μ,1) on {ST < K}.
+
+    Raises the elite level toward z_K = (log(K/S0)-(r-σ²/2)T)/(σ√T) over at most
+    `iters` pilot rounds, each refitting μ to the likelihood-weighted mean of the
+    elite draws; returns (μ*, pilot draws used)."""
+    rng = np.random.default_rng(rng)
+    zK  = (np.log(K/S0)-(r-.5*sigma**2)*T)/(sigma*np.sqrt(T))
+    mu, used = 0., 0
+    for _ in range(iters):
+        Z     = rng.normal(mu, 1, n)
+        used += n
+        lvl   = max(np.quantile(Z, rho), zK)
+        el    = Z <= lvl
+        w     = np.exp(-mu*Z[el]+.5*mu**2)
+        mu    = float((w*Z[el]).sum()/w.sum())
+        if lvl == zK:
+            break
+    return mu, used
+
+
+@dataclass
+class AdaptiveResult:
+    mu:        float                 # tuned drift shift
+    trials:    Moments               # likelihood-weighted crash indicator
+    pilot:     int                   # draws spent tuning μ
+    target:    float                 # requested relative std-error
+    converged: bool
+    trace:     np.ndarray            # (k,3): n, running estimate, std-error per batch
+    elapsed:   float = 0.
+
+    @property
+    def p(self):
+        return self.trials.mean
+
+    @property
+    def se(self):
+        return self.trials.se
+
+    @property
+    def n(self):
+        return self.trials.n
+
+    @property
+    def rse(self):
+        return self.se/self.p if self.p else float("inf")
+
+
+def adaptive_is(S0, K, T, r, sigma, target=.01, seed=None, batch=BATCH, max_n=MAX_N, mu=None, progress=None):
+    """IS with a CE-tuned shift, drawing `batch`es until se/p ≤ `target` or `max_n`.
+
+    `progress(n, p, se)` is called after every batch; an exception it raises aborts
+    the run."""
+    t0      = time.perf_counter()
+    ss      = np.random.SeedSequence(seed, spawn_key=(_STREAM["adaptive"],))
+    pss, ms = ss.spawn(2)
+    pilot   = 0
+    if mu is None:
+        mu, pilot = ce_shift(S0, K, T, r, sigma, rng=np.random.default_rng(pss))
+    rng     = np.random.default_rng(ms)
+    acc, trace = Moments(), []
+    while acc.n < max_n:
+        _, _, _, wp = is_mc(S0, K, T, r, sigma, min(batch, max_n-acc.n), rng, mu)
+        acc.merge(Moments.of(wp))
+        trace.append((acc.n, acc.mean, acc.se))
+        if progress is not None:
+            progress(acc.n, acc.mean, acc.se)
+        if acc.mean > 0 and acc.se/acc.mean <= target:
+            break
+    return AdaptiveResult(mu, acc, pilot, target, bool(acc.mean > 0 and acc.se/acc.mean <= target),
+                          np.array(trace, dtype=float), time.perf_counter()-t0)
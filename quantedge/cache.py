@@ -0,0 +1,77 @@
+"""Bounded in-memory LRU for simulation results keyed by their parameters."""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+MAX_BYTES = 512 << 20
+
+
+def nbytes(obj, _depth=0):
+    # array payload of a result object — what actually dominates its footprint
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes
+    if _depth > 3:
+        return 0
+    if isinstance(obj, (tuple, list)):
+        return sum(nbytes(o, _depth+1) for o in obj)
+    if isinstance(obj, dict):
+        return sum(nbytes(o, _depth+1) for o in obj.values())
+    if hasattr(obj, "__dict__"):
+        return sum(nbytes(o, _depth+1) for o in vars(obj).values())
+    return 0
+
+
+def result_key(S0, K, T, r, sigma, N, seed, method, **extra):
+    # floats rounded so widget round-trips (e.g. S0·crash_pct/100) hit the same entry
+    return (round(float(S0), 10), round(float(K), 10), float(T), float(r), round(float(sigma), 10),
+            int(N), None if seed is None else int(seed), method, *sorted(extra.items()))
+
+
+class ResultCache:
+    """Thread-safe LRU evicting least-recently-used entries beyond `max_bytes`."""
+
+    def __init__(self, max_bytes=MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._d, self._size, self._lock = OrderedDict(), 0, threading.Lock()
+        self.hits = self.misses = 0
+
+    def __len__(self):
+        return len(self._d)
+
+    def __contains__(self, key):
+        return key in self._d
+
+    @property
+    def size(self):
+        return self._size
+
+    def get(self, key):
+        with self._lock:
+            if key in self._d:
+                self._d.move_to_end(key)
+                self.hits += 1
+                return self._d[key][0]
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        sz = nbytes(value)
+        with self._lock:
+            if key in self._d:
+                self._size -= self._d.pop(key)[1]
+            if sz > self.max_bytes:
+                return value
+            self._d[key] = (value, sz)
+            self._size  += sz
+            while self._size > self.max_bytes:
+                self._size -= self._d.popitem(last=False)[1][1]
+        return value
+
+    def get_or_run(self, key, fn, *args, **kw):
+        hit = self.get(key)
+        return hit if hit is not None else self.put(key, fn(*args, **kw))
+
+    def clear(self):
+        with self._lock:
+            self._d.clear(); self._size = 0
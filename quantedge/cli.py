@@ -0,0 +1,130 @@
+"""Batch risk runs outside Streamlit.
+
+    python -m quantedge scenarios.csv -o results.csv [--methods naive,is,barrier] [--workers 4]
+
+Scenarios come from CSV (one per row) or JSON (a list of objects, or one object per
+line). Recognised fields — anything missing takes the dashboard default:
+
+    ticker, period, S0, sigma, crash_pct | K, T, r, N, seed
+
+With a ticker, S0 and sigma default to its cached market statistics. Methods
+`qmc` and `qmc-is` are randomised QMC over the naive and IS estimators, written
+as qmc_p / qmc_se and qmc_is_p / qmc_is_se. Results are written as CSV, JSON or
+JSON lines according to the output file's extension."""
+import argparse
+import csv
+import json
+import sys
+import time
+from pathlib import Path
+
+DEFAULTS = dict(period="1y", S0=100., sigma=.2, crash_pct=70., T=1., r=.05, N=5000, seed=42)
+METHODS  = ("naive", "is", "qmc", "qmc-is", "adaptive", "barrier")
+
+
+def load_scenarios(path):
+    path = Path(path)
+    text = sys.stdin.read() if str(path) == "-" else path.read_text()
+    if path.suffix.lower() in (".json", ".jsonl") or text.lstrip()[:1] in "[{":
+        text = text.strip()
+        return json.loads(text) if text.startswith("[") else [json.loads(l) for l in text.splitlines() if l.strip()]
+    return [{k: v for k, v in row.items() if v not in (None, "")} for row in csv.DictReader(text.splitlines())]
+
+
+def resolve(sc, cache=None):
+    # fill defaults; a ticker supplies S0 / sigma unless the scenario pins them
+    given, sc = sc, {**DEFAULTS, **sc}
+    if given.get("ticker") and not {"S0", "sigma"} <= given.keys():
+        from .data import PriceCache
+        _, stats, _ = (cache or PriceCache()).load(given["ticker"], sc["period"])
+        sc.update({k: stats[k] for k in ("S0", "sigma") if k not in given})
+    for k in ("S0", "sigma", "crash_pct", "T", "r"):
+        sc[k] = float(sc[k])
+    sc["N"], sc["seed"] = int(float(sc["N"])), int(float(sc["seed"]))
+    sc["K"] = float(sc["K"]) if "K" in sc else sc["S0"]*sc["crash_pct"]/100
+    return sc
+
+
+def run_scenario(sc, methods=("naive", "is"), workers=1, barrier_steps=12, target=.01):
+    import numpy as np
+    from scipy.stats import norm
+    from .engine import simulate
+
+    t0  = time.perf_counter()
+    S0, K, T, r, sigma, N, seed = (sc[k] for k in ("S0", "K", "T", "r", "sigma", "N", "seed"))
+    d2  = (np.log(S0/K)+(r-.5*sigma**2)*T)/(sigma*np.sqrt(T))
+    out = {k: sc.get(k) for k in ("ticker", "S0", "K", "T", "r", "sigma", "N", "seed")}
+    out["analytic_p"] = float(norm.cdf(-d2))
+    for m in methods:
+        if m in ("naive", "is"):
+            res = simulate(S0, K, T, r, sigma, N, m, seed=seed, workers=workers)
+            out[f"{m}_p"], out[f"{m}_se"] = res.p, float(res.se)
+            if m == "naive":
+                for c in (.95, .99):
+                    out[f"var{c*100:.0f}"], out[f"cvar{c*100:.0f}"] = map(float, res.var_cvar(c))
+        elif m in ("qmc", "qmc-is"):
+            from .qmc import qmc_mc
+            res = qmc_mc(S0, K, T, r, sigma, N, "naive" if m == "qmc" else "is", seed=seed)
+            col = m.replace("-", "_")
+            out[f"{col}_p"], out[f"{col}_se"] = res.p, res.se
+        elif m == "adaptive":
+            from .adaptive import adaptive_is
+            res = adaptive_is(S0, K, T, r, sigma, target, seed=seed)
+            out.update(adaptive_p=res.p, adaptive_se=float(res.se), adaptive_n=res.n, adaptive_mu=res.mu)
+        elif m == "barrier":
+            from .paths import barrier_mc, barrier_prob
+            res = barrier_mc(S0, K, T, r, sigma, N, barrier_steps, seed)
+            out.update(touch_analytic=float(barrier_prob(S0, K, T, r, sigma)),
+                       touch_p=res["p"], touch_se=res["se"])
+    out["elapsed"] = time.perf_counter()-t0
+    return out
+
+
+def write_results(rows, path):
+    path = Path(path)
+    fh   = sys.stdout if str(path) == "-" else open(path, "w", newline="")
+    try:
+        if path.suffix.lower() == ".json":
+            json.dump(rows, fh, indent=1)
+        elif path.suffix.lower() == ".jsonl":
+            fh.writelines(json.dumps(r)+"\n" for r in rows)
+        else:
+            cols = list(dict.fromkeys(k for r in rows for k in r))
+            w = csv.DictWriter(fh, cols)
+            w.writeheader(); w.writerows(rows)
+    finally:
+        if fh is not sys.stdout:
+            fh.close()
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m quantedge", description=__doc__,
+                                 formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("scenarios", help="CSV / JSON / JSON-lines file, or - for stdin")
+    ap.add_argument("-o", "--output", default="-", help="results file (.csv/.json/.jsonl), default stdout as CSV")
+    ap.add_argument("--methods", default="naive,is", help=f"comma-separated subset of {','.join(METHODS)}")
+    ap.add_argument("--workers", type=int, default=1, help="process-pool workers per simulation")
+    ap.add_argument("--barrier-steps", type=int, default=12)
+    ap.add_argument("--target", type=float, default=.01, help="relative se for the adaptive method")
+    ap.add_argument("--data", help="read prices from this directory instead of Yahoo Finance")
+    a = ap.parse_args(argv)
+
+    methods = [m.strip() for m in a.methods.split(",") if m.strip()]
+    bad     = set(methods)-set(METHODS)
+    if bad:
+        ap.error(f"unknown method(s): {', '.join(sorted(bad))}")
+    cache = None
+    if a.data:
+        from .data import FileSource, PriceCache
+        cache = PriceCache(source=FileSource(a.data))
+
+    rows = []
+    for i, sc in enumerate(load_scenarios(a.scenarios)):
+        try:
+            rows.append({"scenario": i, **run_scenario(resolve(sc, cache), methods, a.workers,
+                                                       a.barrier_steps, a.target)})
+        except Exception as e:
+            rows.append({"scenario": i, "error": f"{type(e).__name__}: {e}"})
+            print(f"scenario {i}: {e}", file=sys.stderr)
+    write_results(rows, a.output)
+    return 1 if any("error" in r for r in rows) else 0
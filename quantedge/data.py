@@ -0,0 +1,199 @@
+"""Market-data sources and a persistent on-disk cache of prices + derived statistics."""
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+import numpy as np
+
+CACHE_DIR     = Path(os.environ.get("QUANTEDGE_CACHE", Path.home()/".cache"/"quantedge"))
+TTL           = 6*3600       # seconds before a cached series is refetched
+MAX_ENTRIES   = 2048         # LRU bound on (ticker, period) entries
+FETCH_WORKERS = 16           # concurrent fetches in load_many
+PERIODS       = {"1mo": 21, "3mo": 63, "6mo": 126, "1y": 252, "2y": 504, "5y": 1260}
+
+
+# ─── SOURCES ──────────────────────────────────────────────────────────────────
+# anything with .history(ticker, period) -> OHLC DataFrame indexed by date
+
+class YahooSource:
+    name = "yahoo"
+
+    def __init__(self, session=None):
+        self.session = session       # one HTTP session reused by every fetch thread
+
+    def history(self, ticker, period):
+        import yfinance as yf
+        hist = yf.Ticker(ticker, session=self.session).history(period=period)
+        if hist.empty:
+            raise ValueError(f"no price history for {ticker!r}")
+        return hist
+
+
+class FileSource:
+    """Offline stand-in: reads <root>/<TICKER>.csv|.parquet and trims to `period`."""
+    name = "file"
+
+    def __init__(self, root):
+        self.root = Path(root)
+
+    def history(self, ticker, period):
+        import pandas as pd
+        for ext in (".parquet", ".csv"):
+            f = self.root/f"{ticker.upper()}{ext}"
+            if f.exists():
+                hist = pd.read_parquet(f) if ext == ".parquet" else pd.read_csv(f, index_col=0, parse_dates=True)
+                return hist.tail(PERIODS.get(period, len(hist))).copy()
+        raise FileNotFoundError(f"no price file for {ticker!r} in {self.root}")
+
+
+def default_source():
+    # QUANTEDGE_DATA=<dir> swaps Yahoo for local files (offline runs, benchmarks)
+    root = os.environ.get("QUANTEDGE_DATA")
+    if root:
+        return FileSource(root)
+    # yfinance needs a curl_cffi session; it keeps a curl handle per thread and
+    # shares cookies and the Yahoo crumb across all of load_many's fetch threads
+    from curl_cffi import requests as curl_requests
+    return YahooSource(curl_requests.Session(impersonate="chrome"))
+
+
+# ─── DERIVED STATISTICS ───────────────────────────────────────────────────────
+def trading_days(index):
+    # bar timestamps -> naive calendar dates. Yahoo stamps each bar at exchange-local
+    # midnight, so the zone is dropped rather than converted: converting would move
+    # Amsterdam's midnight onto the previous UTC day
+    import pandas as pd
+    idx = pd.DatetimeIndex(index)
+    return (idx if idx.tz is None else idx.tz_localize(None)).normalize()
+
+
+def return_stats(hist):
+    # adds the "Log Returns" column in place and returns the sidebar statistics
+    hist["Log Returns"] = np.log(hist["Close"] / hist["Close"].shift(1))
+    dr = hist["Log Returns"].dropna()
+    return {"sigma": float(dr.std()*np.sqrt(252)), "S0": float(hist["Close"].iloc[-1]),
+            "skewness": float(dr.skew()), "kurtosis": float(dr.kurtosis())}
+
+
+# ─── CACHE ────────────────────────────────────────────────────────────────────
+class PriceCache:
+    """(ticker, period) → Parquet file + stats in index.json, with TTL and LRU eviction.
+
+    Safe to share between Streamlit sessions in one process; files are replaced
+    atomically so concurrent processes at worst refetch."""
+
+    def __init__(self, root=CACHE_DIR, source=None, ttl=TTL, max_entries=MAX_ENTRIES):
+        self.root, self.ttl, self.max_entries = Path(root), ttl, max_entries
+        self.source = source or default_source()
+        self._lock  = threading.Lock()
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    @property
+    def _index_path(self):
+        return self.root/"index.json"
+
+    def _read_index(self):
+        try:
+            return json.loads(self._index_path.read_text())
+        except (OSError, ValueError):
+            return {}
+
+    def _write_index(self, idx):
+        tmp = self._index_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(idx))
+        os.replace(tmp, self._index_path)
+
+    def _key(self, ticker, period):
+        return f"{self.source.name}:{ticker.upper()}:{period}"
+
+    def _file(self, key):
+        return self.root/(key.replace(":", "_")+".parquet")
+
+    def load(self, ticker, period, refresh=False):
+        """Return (hist, stats, hit) — fetching through the source on miss or expiry."""
+        import pandas as pd
+        key, now = self._key(ticker, period), time.time()
+        with self._lock:
+            ent = self._read_index().get(key)
+        # the Parquet read runs outside the lock so bulk loads overlap
+        if ent and not refresh and now-ent["fetched"] < self.ttl and self._file(key).exists():
+            try:
+                hist = pd.read_parquet(self._file(key))
+            except (OSError, ValueError):
+                hist = None
+            if hist is not None:
+                with self._lock:
+                    idx = self._read_index()
+                    if key in idx:
+                        idx[key]["accessed"] = now
+                        self._write_index(idx)
+                return hist, ent["stats"], True
+
+        hist  = self.source.history(ticker, period)
+        stats = return_stats(hist)
+
+        with self._lock:
+            idx = self._read_index()
+            tmp = self._file(key).with_suffix(".tmp")
+            hist.to_parquet(tmp)
+            os.replace(tmp, self._file(key))
+            idx[key] = {"fetched": now, "accessed": now, "stats": stats}
+            for old in sorted(idx, key=lambda k: idx[k]["accessed"])[:max(len(idx)-self.max_entries, 0)]:
+                self._file(old).unlink(missing_ok=True)
+                del idx[old]
+            self._write_index(idx)
+        return hist, stats, False
+
+    def peek(self, tickers, period):
+        """{ticker: (hist, stats)} for every fresh hit — one index read and write
+        for the whole batch instead of one per ticker."""
+        import pandas as pd
+        now = time.time()
+        with self._lock:
+            idx = self._read_index()
+        out = {}
+        for t in tickers:
+            ent = idx.get(self._key(t, period))
+            if ent and now-ent["fetched"] < self.ttl:
+                try:
+                    out[t] = pd.read_parquet(self._file(self._key(t, period))), ent["stats"]
+                except (OSError, ValueError):
+                    pass
+        if out:
+            with self._lock:
+                idx = self._read_index()
+                for t in out:
+                    if self._key(t, period) in idx:
+                        idx[self._key(t, period)]["accessed"] = now
+                self._write_index(idx)
+        return out
+
+    def clear(self):
+        with self._lock:
+            for k in self._read_index():
+                self._file(k).unlink(missing_ok=True)
+            self._index_path.unlink(missing_ok=True)
+
+
+def load_many(tickers, period, cache, workers=FETCH_WORKERS):
+    """Cache-through fetch of many tickers on a thread pool (fetches are I/O bound).
+
+    Returns ({ticker: hist}, {ticker: stats}, {ticker: error message})."""
+    hists, stats, errors = {}, {}, {}
+    for t, (h, s) in (cache.peek(tickers, period) if hasattr(cache, "peek") else {}).items():
+        hists[t], stats[t] = h, s
+    todo = [t for t in tickers if t not in hists]
+    with ThreadPoolExecutor(max(min(workers, len(todo)), 1)) as ex:
+        futs = {ex.submit(cache.load, t, period): t for t in todo}
+        for f in as_completed(futs):
+            t = futs[f]
+            try:
+                hists[t], stats[t], _ = f.result()
+            except Exception as e:
+                errors[t] = str(e)
+    order = {t: i for i, t in enumerate(tickers)}
+    srt   = lambda d: dict(sorted(d.items(), key=lambda kv: order[kv[0]]))
+    return srt(hists), srt(stats), srt(errors)
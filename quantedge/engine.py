@@ -0,0 +1,342 @@
+"""Chunked Monte Carlo engine: estimators, streaming moments and a quantile sketch."""
+import multiprocessing
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from .risk import BOOT, LEVELS, is_weights, tail_risk, weighted_var_cvar
+
+CHUNK = 1 << 16      # draws per block — bounds working memory regardless of N
+KEEP  = 20000        # leading draws retained for charts / export
+BINS  = 1 << 13      # quantile-sketch resolution
+SPAN  = 8.5          # sketch covers mean ± SPAN·sd of log(ST/S0)
+GROUP = 8            # chunks whose sketch counts are summed before merging
+POOL_WORKERS = int(os.environ.get("QUANTEDGE_POOL_WORKERS", 0)) or os.cpu_count() or 1
+
+
+# ─── ARRAY ESTIMATORS ─────────────────────────────────────────────────────────
+def naive_mc(S0, K, T, r, sigma, N, rng=None):
+    rng = np.random if rng is None else rng
+    Z  = rng.normal(0, 1, N)
+    ST = S0 * np.exp((r-.5*sigma**2)*T + sigma*np.sqrt(T)*Z)
+    p  = (ST < K).astype(float)
+    return np.mean(p), np.std(p)/np.sqrt(N), ST, p
+
+def is_shift(S0, K, T, r, sigma):
+    sb = (np.log(K/S0)-(r-.5*sigma**2)*T)/(sigma*np.sqrt(T))
+    return sb-.5
+
+def is_mc(S0, K, T, r, sigma, N, rng=None, mu=None):
+    rng = np.random if rng is None else rng
+    mu = is_shift(S0, K, T, r, sigma) if mu is None else mu
+    Z  = rng.normal(mu, 1, N)
+    ST = S0*np.exp((r-.5*sigma**2)*T+sigma*np.sqrt(T)*Z)
+    w  = np.exp(-mu*Z+.5*mu**2)
+    wp = (ST<K).astype(float)*w
+    return np.mean(wp), np.std(wp)/np.sqrt(N), ST, wp
+
+def var_cvar(ret, c=.95):
+    v = np.percentile(ret,(1-c)*100)
+    return v, ret[ret<=v].mean()
+
+def running_bands(tr, z=1.96):
+    # running mean / std-error / CI along the last axis in one cumulative pass;
+    # shifting by the overall mean keeps E[x²]-E[x]² from cancelling
+    tr = np.asarray(tr, dtype=float)
+    n  = np.arange(1, tr.shape[-1]+1)
+    c  = tr.mean(axis=-1, keepdims=True)
+    d  = tr-c
+    m  = np.cumsum(d, axis=-1)/n
+    se = np.sqrt(np.maximum(np.cumsum(d*d, axis=-1)/n-m*m, 0))/np.sqrt(n)
+    m  = m+c
+    return m, se, m-z*se, m+z*se
+
+
+# ─── SUFFICIENT STATISTICS ────────────────────────────────────────────────────
+class Moments:
+    """Count / mean / centred sum of squares, mergeable with Chan's update."""
+    __slots__ = ("n", "mean", "m2")
+
+    def __init__(self, n=0, mean=0., m2=0.):
+        self.n, self.mean, self.m2 = n, mean, m2
+
+    @classmethod
+    def of(cls, x):
+        x = np.asarray(x, dtype=float)
+        if not x.size:
+            return cls()
+        m = x.mean()
+        return cls(x.size, float(m), float(np.square(x-m).sum()))
+
+    def merge(self, o):
+        n = self.n+o.n
+        if o.n:
+            d = o.mean-self.mean
+            self.mean += d*o.n/n
+            self.m2   += o.m2+d*d*self.n*o.n/n
+            self.n     = n
+        return self
+
+    @property
+    def var(self):
+        return self.m2/self.n if self.n else 0.
+
+    @property
+    def std(self):
+        return np.sqrt(self.var)
+
+    @property
+    def se(self):
+        return np.sqrt(self.var/self.n) if self.n else 0.
+
+
+class QuantileSketch:
+    """Fixed-grid histogram with under/overflow bins; merges by adding counts.
+
+    A `weighted` sketch holds float sums of per-draw weights (IS likelihood ratios
+    span dozens of orders of magnitude, so no fixed-point unit fits them)."""
+
+    def __init__(self, lo, hi, bins=BINS, weighted=False):
+        self.lo, self.hi, self.bins = float(lo), float(hi), bins
+        self.w        = (self.hi-self.lo)/bins
+        self.weighted = weighted
+        self.counts   = np.zeros(bins+2, dtype=float if weighted else np.int64)
+
+    @property
+    def n(self):
+        # draws added, or their total weight when weighted
+        return float(self.counts.sum()) if self.weighted else int(self.counts.sum())
+
+    def add(self, x, w=None):
+        i = np.clip(np.floor((np.asarray(x)-self.lo)/self.w).astype(np.int64)+1, 0, self.bins+1)
+        self.counts += np.bincount(i, w, self.bins+2)
+        return self
+
+    def merge(self, o):
+        self.counts += o.counts
+        return self
+
+    def quantile(self, q, total=None):
+        # `total` is the mass q is a fraction of — the draw count for IS weights,
+        # whose sum falls short of it when the shift looks past the quantile; NaN
+        # when the sketch holds less than q·total
+        cum = np.cumsum(self.counts)
+        t   = q*(cum[-1] if total is None else total)
+        if not cum[-1] or t > cum[-1]:
+            return np.nan
+        i   = int(np.clip(np.searchsorted(cum, t), 1, self.bins))
+        below = cum[i-1]
+        frac  = (t-below)/self.counts[i] if self.counts[i] else 0.
+        return self.lo+(i-1+np.clip(frac, 0, 1))*self.w
+
+    def tail_mean(self, xq, f=lambda x: x):
+        # mean of f(x) over x <= xq, each bin represented by its midpoint
+        if np.isnan(xq):
+            return np.nan
+        e   = self.lo+np.arange(self.bins+1)*self.w
+        mid = np.concatenate([[self.lo], (e[:-1]+e[1:])/2, [self.hi]])
+        j   = int(np.clip(np.floor((xq-self.lo)/self.w), -1, self.bins))+1
+        c   = self.counts[:j+1].astype(float)
+        if 1 <= j <= self.bins:
+            part = (xq-e[j-1])/self.w
+            c[j] *= part
+            mid   = mid.copy(); mid[j] = (e[j-1]+xq)/2
+        tot = c.sum()
+        return float((c*f(mid[:j+1])).sum()/tot) if tot else float(f(xq))
+
+
+# ─── CHUNKED DRIVER ───────────────────────────────────────────────────────────
+@dataclass
+class MCResult:
+    method:  str
+    S0:      float
+    n:       int
+    trials:  Moments                 # crash indicator (naive) / weighted indicator (IS)
+    returns: Moments                 # simple returns (ST-S0)/S0 under the sampling measure
+    hits:    int                     # draws with ST < K under the sampling measure
+    ST:      np.ndarray              # leading `keep` terminal prices
+    tr:      np.ndarray              # matching trial values
+    trace:   np.ndarray              # (k,3): n, running estimate, std-error at chunk ends
+    sketch:  QuantileSketch = field(default=None, repr=False)   # likelihood-weighted for IS
+    seed:    int = None              # SeedSequence entropy — reproduces the run
+    elapsed: float = 0.              # wall seconds spent simulating
+    w:       np.ndarray = field(default=None, repr=False)       # IS likelihood ratios of ST
+
+    @property
+    def p(self):
+        return self.trials.mean
+
+    @property
+    def se(self):
+        return self.trials.se
+
+    @property
+    def ret(self):
+        return (self.ST-self.S0)/self.S0
+
+    def var_cvar(self, c=.95):
+        # exact while every draw was kept, sketch-based beyond that; IS draws are
+        # weighted by their likelihood ratios, so both methods describe the original
+        # measure rather than the sampling one
+        if len(self.ST) == self.n or self.sketch is None:
+            if self.w is None:
+                return var_cvar(self.ret, c)
+            v, cv = weighted_var_cvar(self.ret, self.w, [c])
+            return float(v[0]), float(cv[0])
+        xq = self.sketch.quantile(1-c, self.n)
+        return float(np.expm1(xq)), self.sketch.tail_mean(xq, np.expm1)
+
+    def tail_risk(self, levels=LEVELS, B=BOOT, seed=None):
+        # all levels plus bootstrap CIs from the retained draws; when the estimates
+        # come from the sketch, the prefix's CI is recentred on them and narrowed
+        # by √(kept/n), the usual 1/√n scaling of quantile estimators
+        res = tail_risk(self.ret, levels, w=self.w, B=B, seed=seed)
+        if len(self.ST) == self.n or self.sketch is None:
+            return res
+        v, c = map(np.array, zip(*(self.var_cvar(l) for l in levels)))
+        k    = np.sqrt(len(self.ST)/self.n)
+        if B:
+            res.var_ci, res.cvar_ci = v+(res.var_ci-res.var)*k, c+(res.cvar_ci-res.cvar)*k
+        res.var, res.cvar, res.n = v, c, self.n
+        return res
+
+
+_STREAM = {"naive": 0, "is": 1, "paths": 2, "barrier": 3, "qmc": 4, "adaptive": 5, "portfolio": 6, "sweep": 7,
+           "screener": 8}
+
+
+_POOL, _POOL_LOCK = None, threading.Lock()
+
+
+def _pool(broken=None):
+    # one process pool for every simulate call in this process, so concurrent runs
+    # share POOL_WORKERS processes instead of each starting its own. Workers come
+    # from a forkserver where available (forking the multi-threaded app server
+    # directly can deadlock), else spawn. Passing the pool that raised
+    # BrokenProcessPool replaces it, unless another caller already has
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None or _POOL is broken:
+            if broken is not None:
+                broken.shutdown(wait=False, cancel_futures=True)
+            ctx   = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            _POOL = ProcessPoolExecutor(POOL_WORKERS, mp_context=multiprocessing.get_context(ctx))
+        return _POOL
+
+
+def _ordered(fn, args, window):
+    # results of fn(*a) in order with at most `window` tasks in the shared pool;
+    # tasks hit by a broken pool are resubmitted once to a fresh one (every task
+    # owns its seeds, so a rerun is identical), and tasks not yet started are
+    # cancelled when the consumer stops early
+    ex, pend = _pool(), deque()
+
+    def submit(a):
+        nonlocal ex
+        try:
+            return ex.submit(fn, *a)
+        except BrokenProcessPool:
+            ex = _pool(ex)
+            return ex.submit(fn, *a)
+
+    def result(f, a):
+        nonlocal ex
+        try:
+            return f.result()
+        except BrokenProcessPool:
+            ex = _pool(ex)
+            for i, (g, b) in enumerate(pend):
+                if not (g.done() and not g.cancelled() and g.exception() is None):
+                    pend[i] = ex.submit(fn, *b), b
+            return ex.submit(fn, *a).result()
+
+    try:
+        for a in args:
+            pend.append((submit(a), a))
+            if len(pend) >= window:
+                yield result(*pend.popleft())
+        while pend:
+            yield result(*pend.popleft())
+    finally:
+        for f, _ in pend:
+            f.cancel()
+
+
+def _block(method, S0, K, T, r, sigma, sizes, seeds, keep, span):
+    # one worker's contiguous run of chunks; each chunk owns its spawned stream so
+    # the draws never depend on how chunks were assigned to workers
+    est    = naive_mc if method == "naive" else is_mc
+    mu     = is_shift(S0, K, T, r, sigma) if method == "is" else None
+    sketch = QuantileSketch(*span, weighted=mu is not None)
+    stats, groups, kST, ktr, kw = [], [], [], [], []
+    for k, (n, ss) in enumerate(zip(sizes, seeds)):
+        _, _, ST, tr = est(S0, K, T, r, sigma, n, np.random.default_rng(ss))
+        w = None if mu is None else is_weights(S0, T, r, sigma, ST, mu)
+        sketch.add(np.log(ST/S0), w)
+        if keep > 0:
+            kST.append(ST[:keep]); ktr.append(tr[:keep])
+            if w is not None:
+                kw.append(w[:keep])
+            keep -= n
+        stats.append((Moments.of(tr), Moments.of((ST-S0)/S0), int(np.count_nonzero(ST < K))))
+        if (k+1) % GROUP == 0 or k == len(sizes)-1:
+            # runs start on GROUP boundaries, so these are the same groups for any
+            # split and float weight sums add up in one order
+            groups.append(sketch.counts)
+            sketch = QuantileSketch(*span, weighted=mu is not None)
+    return stats, groups, kST, ktr, kw
+
+
+def simulate(S0, K, T, r, sigma, N, method="naive", seed=None, chunk=CHUNK, keep=KEEP, workers=1,
+             progress=None, batch=8):
+    """Run `method` ("naive" / "is") over N draws in blocks of `chunk`, keeping only
+    sufficient statistics plus the first `keep` draws.
+
+    Chunk i draws from the i-th child of ``SeedSequence(seed)``, and partial results
+    are merged in chunk order, so a given seed reproduces the same estimate,
+    std-error and VaR for any number of `workers`.
+
+    With `progress`, chunks run in batches of `batch` (rounded up to whole
+    GROUPs) and progress(n, p, se) is called after each one is merged; an
+    exception it raises aborts the run."""
+    t0     = time.perf_counter()
+    ss     = np.random.SeedSequence(seed, spawn_key=(_STREAM[method],))
+    nch    = max(-(-N//chunk), 1)
+    sizes  = [min(chunk, N-i*chunk) for i in range(nch)]
+    seeds  = ss.spawn(nch)
+    m, s   = (r-.5*sigma**2)*T, sigma*np.sqrt(T)
+    span   = (m-SPAN*s, m+SPAN*s)
+    nw     = max(min(workers, nch), 1)
+    ng     = -(-nch//GROUP)
+    gs     = np.array_split(np.arange(ng), min(nw if progress is None else max(-(-ng//-(-batch//GROUP)), nw), ng))
+    parts  = [np.arange(g[0]*GROUP, min((g[-1]+1)*GROUP, nch)) for g in gs]
+    args   = [(method, S0, K, T, r, sigma, [sizes[i] for i in p], [seeds[i] for i in p],
+               keep-int(p[0])*chunk, span) for p in parts]
+    out    = _ordered(_block, args, nw) if nw > 1 else (_block(*a) for a in args)
+
+    sketch = QuantileSketch(*span, weighted=method == "is")
+    trials, rets, hits = Moments(), Moments(), 0
+    kST, ktr, kw, trace = [], [], [], []
+    try:
+        for stats, groups, ks, kt, w in out:
+            for counts in groups:
+                sketch.counts += counts
+            kST += ks; ktr += kt; kw += w
+            for mt, mr, h in stats:
+                trials.merge(mt); rets.merge(mr); hits += h
+                trace.append((trials.n, trials.mean, trials.se))
+            if progress is not None:
+                progress(trials.n, trials.mean, trials.se)
+    finally:
+        out.close()
+    return MCResult(method, float(S0), int(N), trials, rets, hits,
+                    np.concatenate(kST) if kST else np.empty(0),
+                    np.concatenate(ktr) if ktr else np.empty(0),
+                    np.array(trace, dtype=float).reshape(-1, 3), sketch, ss.entropy,
+                    time.perf_counter()-t0, np.concatenate(kw) if kw else None)
@@ -0,0 +1,81 @@
+"""Per-draw and summary exports — chunked CSV, Parquet, compressed .npz and Arrow IPC.
+
+Everything works on a dict of equal-length columns and writes to a path or binary
+file object, so nothing is formatted until an export is actually requested."""
+import io
+
+import numpy as np
+
+CSV_ROWS = 1<<16        # rows formatted per CSV write
+FORMATS  = {            # name: (extension, mime)
+    "csv":     ("csv",     "text/csv"),
+    "parquet": ("parquet", "application/vnd.apache.parquet"),
+    "npz":     ("npz",     "application/octet-stream"),
+    "arrow":   ("arrow",   "application/vnd.apache.arrow.file"),
+}
+
+
+def draw_columns(nm, im, float32=False):
+    # the per-draw table for a naive / IS pair of MCResults (their retained prefix)
+    n  = min(len(nm.ST), len(im.ST))
+    ft = np.float32 if float32 else np.float64
+    f  = lambda a: np.asarray(a[:n], dtype=ft)
+    return {"Simulation": np.arange(1, n+1),
+            "Naive_Price": f(nm.ST), "IS_Price": f(im.ST),
+            "Naive_Returns": f(nm.ret), "IS_Returns": f(im.ret),
+            "Naive_Crash": f(nm.tr), "IS_Crash": f(im.tr)}
+
+
+def summary_columns(rows):
+    # list of per-method dicts -> columns; missing fields become NaN
+    keys = list(dict.fromkeys(k for r in rows for k in r))
+    cols = {}
+    for k in keys:
+        vals = [r.get(k) for r in rows]
+        cols[k] = (np.array([np.nan if v is None else v for v in vals], dtype=float)
+                   if all(v is None or isinstance(v, (int, float, np.number)) for v in vals)
+                   else np.array(["" if v is None else str(v) for v in vals]))
+    return cols
+
+
+def write_csv(cols, fh, rows=CSV_ROWS):
+    # formats `rows` at a time, so a large export never exists as one string
+    import pandas as pd
+    n = len(next(iter(cols.values()))) if cols else 0
+    for i in range(0, max(n, 1), rows):
+        pd.DataFrame({k: a[i:i+rows] for k, a in cols.items()}).to_csv(fh, header=not i, index=False)
+
+
+def _table(cols):
+    import pyarrow as pa
+    return pa.table({k: (pa.array(a) if a.dtype.kind != "U" else pa.array(a.tolist()))
+                     for k, a in cols.items()})
+
+
+def write(cols, dest, fmt="csv"):
+    # dest is a path or a binary file object
+    if fmt not in FORMATS:
+        raise ValueError(f"unknown export format {fmt!r}; expected one of {', '.join(FORMATS)}")
+    fh = open(dest, "wb") if isinstance(dest, (str, bytes)) or hasattr(dest, "__fspath__") else dest
+    try:
+        if fmt == "csv":
+            write_csv(cols, fh)
+        elif fmt == "npz":
+            np.savez_compressed(fh, **cols)
+        elif fmt == "parquet":
+            import pyarrow.parquet as pq
+            pq.write_table(_table(cols), fh, compression="zstd")
+        else:
+            import pyarrow as pa
+            t = _table(cols)
+            with pa.ipc.new_file(fh, t.schema, options=pa.ipc.IpcWriteOptions(compression="zstd")) as w:
+                w.write_table(t)
+    finally:
+        if fh is not dest:
+            fh.close()
+
+
+def to_bytes(cols, fmt="csv"):
+    buf = io.BytesIO()
+    write(cols, buf, fmt)
+    return buf.getvalue()
@@ -0,0 +1,118 @@
+"""Background simulation jobs on a bounded thread pool shared by every session.
+
+A job is an ordered list of named steps. Each step gets a `report(n, p, se)`
+callback, publishes its partial estimate through it, and stops at the next
+report once the job is cancelled. Readers poll `Job.snapshot()`.
+
+Steps deliver their results by side effect (the app's steps land in its
+ResultCache); a job keeps only progress, never a step's return value, so
+remembered jobs hold no memory outside the cache's bound."""
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from .telemetry import Telemetry, arrays_of
+
+JOB_WORKERS = int(os.environ.get("QUANTEDGE_JOB_WORKERS", 0)) or min(4, os.cpu_count() or 1)
+KEEP_JOBS   = 256           # finished jobs remembered for late pollers
+
+
+class Cancelled(Exception):
+    pass
+
+
+class Job:
+    def __init__(self, steps, **tags):
+        self.id, self.tags = uuid.uuid4().hex[:12], tags
+        self.steps   = [name for name, _ in steps]
+        self.status  = "queued"          # queued / running / done / cancelled / failed
+        self.step, self.completed = None, []    # running step, finished steps in order
+        self.partial = {}                # step -> (n, p, se), latest report
+        self.trace   = {}                # step -> [(n, p, se), ...]
+        self.error   = None
+        self.tel     = Telemetry("job", job=self.id, **tags)
+        self.started = self.finished = None
+        self._fns    = steps
+        self._cancel = threading.Event()
+        self._lock   = threading.Lock()
+
+    def cancel(self):
+        self._cancel.set()
+
+    @property
+    def done(self):
+        return self.status in ("done", "cancelled", "failed")
+
+    def _reporter(self, step):
+        def report(n, p, se):
+            with self._lock:
+                self.partial[step] = (int(n), float(p), float(se))
+                self.trace.setdefault(step, []).append(self.partial[step])
+            if self._cancel.is_set():
+                raise Cancelled(step)
+        return report
+
+    def _run(self):
+        if self._cancel.is_set():
+            self.status = "cancelled"
+            return self
+        self.status, self.started = "running", time.time()
+        try:
+            for name, fn in self._fns:
+                if self._cancel.is_set():
+                    raise Cancelled(name)
+                self.step = name
+                with self.tel.stage(name) as rec:
+                    rec["arrays"] = arrays_of(fn(self._reporter(name)))
+                with self._lock:
+                    self.completed.append(name)
+            self.status = "done"
+        except Cancelled:
+            self.status = "cancelled"
+        except Exception as e:
+            self.status, self.error = "failed", f"{type(e).__name__}: {e}"
+        finally:
+            self.finished = time.time()
+        return self
+
+    def snapshot(self):
+        # consistent copy of everything a progress view needs
+        with self._lock:
+            return {"id": self.id, "status": self.status, "step": self.step, "steps": list(self.steps),
+                    "completed": list(self.completed),
+                    "partial": dict(self.partial), "trace": {k: list(v) for k, v in self.trace.items()},
+                    "error": self.error, "elapsed": ((self.finished or time.time())-self.started
+                                                     if self.started else 0.)}
+
+
+class JobRunner:
+    """Runs jobs on at most `workers` threads; extra jobs queue in submission order.
+
+    Multi-process steps all submit to the engine's one shared pool, so concurrent
+    jobs never use more than engine.POOL_WORKERS processes between them."""
+
+    def __init__(self, workers=JOB_WORKERS):
+        self.workers = workers
+        self._ex     = ThreadPoolExecutor(workers, thread_name_prefix="quantedge-job")
+        self._jobs   = OrderedDict()
+        self._lock   = threading.Lock()
+
+    def submit(self, steps, **tags):
+        job = Job(steps, **tags)
+        with self._lock:
+            self._jobs[job.id] = job
+            for jid in [j for j, jb in self._jobs.items() if jb.done][:max(len(self._jobs)-KEEP_JOBS, 0)]:
+                del self._jobs[jid]
+        self._ex.submit(job._run)
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def active(self):
+        with self._lock:
+            return sum(not j.done for j in self._jobs.values())
@@ -0,0 +1,117 @@
+"""Path-dependent crash risk: streamed GBM walks and barrier-hit estimators."""
+import numpy as np
+
+from .engine import _STREAM, CHUNK, Moments, is_shift
+from .qmc import sobol_normals
+
+
+def gbm_fill(S0, T, r, sigma, Z, shift=0., out=None):
+    # prices on the grid t_k = kT/steps from an (n, steps) block of standard normals,
+    # written into `out` (n, steps+1) with no full-size temporaries: the increments
+    # go into out[:, 1:], are summed and exponentiated in place. `shift` moves the
+    # terminal Z by that many standard deviations (the IS drift of is_shift)
+    n, steps = Z.shape
+    dt  = T/steps
+    out = np.empty((n, steps+1), dtype=Z.dtype) if out is None else out
+    x   = out[:, 1:]
+    out[:, 0] = 0
+    np.multiply(Z, sigma*np.sqrt(dt), out=x)
+    x  += (r-.5*sigma**2)*dt+sigma*shift*dt/np.sqrt(T)
+    np.cumsum(x, axis=1, out=x)
+    np.exp(out, out=out)
+    out *= S0
+    return out
+
+
+def _normals(rng, out, block=CHUNK):
+    # fill a strided 2-D view with standard normals via a CHUNK-sized scratch buffer,
+    # in the same order as rng.standard_normal(out.shape)
+    n, m = out.shape
+    rows = max(block//m, 1)
+    buf  = np.empty((min(rows, n), m), out.dtype)
+    for i in range(0, n, rows):
+        k = min(rows, n-i)
+        rng.standard_normal(out=buf[:k], dtype=out.dtype)
+        out[i:i+k] = buf[:k]
+
+
+def gbm_paths(S0, K, T, r, sigma, n, rng=None, sampler="pseudo", dtype=np.float64):
+    # daily-step GBM paths under P and under the IS stress drift, for the path fan;
+    # sampler="sobol" draws each family from its own scrambled Sobol block
+    rng   = np.random.default_rng() if rng is None else rng
+    steps = int(252*T);  tg = np.linspace(0, T, steps+1)
+    mu_is = is_shift(S0, K, T, r, sigma)
+    fam   = []
+    for shift in (0., mu_is):
+        out = np.empty((n, steps+1), dtype=dtype)
+        if sampler == "sobol":
+            out[:, 1:] = sobol_normals(n, steps, rng)
+        else:
+            _normals(rng, out[:, 1:])
+        fam.append(gbm_fill(S0, T, r, sigma, out[:, 1:], shift, out))
+    return (tg, *fam)
+
+
+def gbm_walk(T, r, sigma, n, steps, rng, shift=0., dtype=np.float64):
+    # log(S_t/S0) for n paths, yielded one grid step at a time — O(n) memory.
+    # The yielded arrays are reused buffers, valid until the next step
+    dt = T/steps
+    d  = (r-.5*sigma**2)*dt+sigma*shift*dt/np.sqrt(T)
+    s  = sigma*np.sqrt(dt)
+    x0, x1, z = np.zeros(n, dtype), np.empty(n, dtype), np.empty(n, dtype)
+    for _ in range(steps):
+        rng.standard_normal(out=z, dtype=dtype)
+        z *= s
+        np.add(x0, d, out=x1)
+        x1 += z
+        yield x0, x1
+        x0, x1 = x1, x0
+
+
+def gbm_stats(S0, K, T, r, sigma, n, steps=252, rng=None, shift=0., dtype=np.float64):
+    """Terminal price, running minimum and barrier hit of n GBM paths, without paths.
+
+    Streams gbm_walk, so memory is a few n-vectors whatever `steps` is. The running
+    minimum is over the monitoring grid; barrier_mc adds the between-step bridge."""
+    rng = np.random.default_rng() if rng is None else rng
+    lo  = np.zeros(n, dtype)
+    for _, x in gbm_walk(T, r, sigma, n, steps, rng, shift, dtype):
+        np.minimum(lo, x, out=lo)
+    ST  = np.exp(x); ST *= S0
+    mn  = np.exp(lo); mn *= S0
+    return {"ST": ST, "min": mn, "hit": lo <= np.log(K/S0)}
+
+
+def barrier_prob(S0, K, T, r, sigma):
+    # closed-form P(min_{t≤T} S_t ≤ K) for GBM, K < S0 (broadcasts)
+    from scipy.stats import norm
+    b, nu, s = np.log(K/S0), r-.5*sigma**2, sigma*np.sqrt(T)
+    return norm.cdf((b-nu*T)/s)+np.exp(2*nu*b/sigma**2)*norm.cdf((b+nu*T)/s)
+
+
+def barrier_mc(S0, K, T, r, sigma, N, steps=12, seed=None, chunk=CHUNK, progress=None):
+    """P(S touches K before T) from `steps`-point walks.
+
+    Between grid points the log-price is a Brownian bridge, which crosses b with
+    probability exp(-2(x0-b)(x1-b)/(σ²dt)); each path scores 1 if a grid point is
+    below b, else 1-∏(1-p_k). The discretely-monitored indicator from the same
+    walks is returned alongside for comparison. `progress(n, p, se)` is called
+    after every chunk; an exception it raises aborts the run."""
+    ss  = np.random.SeedSequence(seed, spawn_key=(_STREAM["barrier"],))
+    b   = np.log(K/S0)
+    c   = 2/(sigma**2*T/steps)
+    br, dc, done = Moments(), Moments(), 0
+    for cs in ss.spawn(max(-(-N//chunk), 1)):
+        n    = min(chunk, N-done)
+        hit  = np.zeros(n, dtype=bool)
+        surv = np.ones(n)
+        for x0, x1 in gbm_walk(T, r, sigma, n, steps, np.random.default_rng(cs)):
+            hit  |= x1 <= b
+            surv *= -np.expm1(-c*np.maximum(x0-b, 0)*np.maximum(x1-b, 0))
+        br.merge(Moments.of(np.where(hit, 1., 1-surv)))
+        dc.merge(Moments.of(hit))
+        done += n
+        if progress is not None:
+            progress(done, br.mean, br.se)
+    return {"p": br.mean, "se": float(br.se), "p_discrete": dc.mean, "se_discrete": float(dc.se),
+            "n": done, "steps": steps}
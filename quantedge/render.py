@@ -0,0 +1,55 @@
+"""Server-side chart reduction: pre-binned histograms and point-budgeted curves."""
+import numpy as np
+import plotly.graph_objects as go
+
+POINTS = 1500        # per-trace point budget for line charts
+BINS   = 60
+
+
+def log_index(x, budget=POINTS):
+    # indices of (sorted) x nearest to `budget` log-spaced targets — dense early,
+    # where a convergence curve moves, sparse late; first and last always kept
+    x = np.asarray(x)
+    if len(x) <= budget:
+        return np.arange(len(x))
+    tg = np.geomspace(max(x[0], 1), x[-1], budget)
+    return np.unique(np.clip(np.searchsorted(x, tg), 0, len(x)-1))
+
+
+def edges(*xs, bins=BINS):
+    # one shared bin grid so overlaid histograms line up
+    lo = min(float(np.min(x)) for x in xs)
+    hi = max(float(np.max(x)) for x in xs)
+    return np.linspace(lo, hi if hi > lo else lo+1, bins+1)
+
+
+def density_bar(x, e, **kw):
+    # histnorm="probability density" computed here; only len(e)-1 bars are sent
+    h, e = np.histogram(x, bins=e, density=True)
+    return go.Bar(x=(e[:-1]+e[1:])/2, y=h, width=np.diff(e), **kw)
+
+
+def path_trace(t, S, **kw):
+    # every row of S as one NaN-separated WebGL polyline — one trace per family
+    n = len(S)
+    x = np.broadcast_to(np.append(t, np.nan), (n, len(t)+1)).ravel()
+    y = np.hstack([S, np.full((n, 1), np.nan)]).ravel()
+    return go.Scattergl(x=x, y=y, mode="lines", connectgaps=False, **kw)
+
+
+FAN_Q = (5, 25, 50, 75, 95)
+
+def fan_traces(t, S, rgb, name, q=FAN_Q):
+    # outer / inner percentile bands plus the median, independent of path count
+    lo, ql, md, qh, hi = np.percentile(S, q, axis=0)
+    band = dict(mode="lines", line=dict(width=0), hoverinfo="skip", legendgroup=name)
+    return [
+        go.Scatter(x=t, y=hi, showlegend=False, **band),
+        go.Scatter(x=t, y=lo, fill="tonexty", fillcolor=f"rgba({rgb},.10)",
+                   name=f"{name} {q[0]}–{q[-1]}%", **band),
+        go.Scatter(x=t, y=qh, showlegend=False, **band),
+        go.Scatter(x=t, y=ql, fill="tonexty", fillcolor=f"rgba({rgb},.22)",
+                   name=f"{name} {q[1]}–{q[-2]}%", **band),
+        go.Scatter(x=t, y=md, mode="lines", line=dict(color=f"rgba({rgb},.9)", width=2),
+                   name=f"{name} median", legendgroup=name),
+    ]
@@ -0,0 +1,138 @@
+"""Watchlist screener: bulk histories, every volatility estimator for every name
+as one (days × tickers) array computation, analytical P(crash) for the whole
+universe and Monte Carlo refinement of the flagged tail only."""
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+from .data import trading_days
+from .engine import _STREAM
+
+ESTIMATORS  = ("close", "ewma", "parkinson", "garman_klass")
+EWMA_LAMBDA = .94        # RiskMetrics daily decay
+FLAG_Q      = .9         # names at or above this quantile of P(crash) get MC
+SCREEN_N    = 20_000     # bootstrap paths per flagged name
+BLOCK       = 1 << 22    # resampled daily returns held at once
+
+
+def ohlc_panel(hists):
+    """{field: (days, tickers) float array} on the union of calendar dates, NaN where
+    a name has no bar. Fields are close, lr (log return), hl = ln(H/L)² and
+    co = ln(C/O)², each derived on the name's own history before aligning, so a date
+    one name did not trade costs no other name a return. Missing High / Low / Open
+    columns leave Parkinson / Garman–Klass NaN."""
+    import pandas as pd
+    def own(h):
+        c   = h["Close"].to_numpy(float)
+        col = lambda f: h[f].to_numpy(float) if f in h else np.full(len(h), np.nan)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return pd.DataFrame({"close": c, "lr": np.r_[np.nan, np.diff(np.log(c))],
+                                 "hl": np.log(col("High")/col("Low"))**2, "co": np.log(c/col("Open"))**2},
+                                index=trading_days(h.index))
+    df = pd.concat({t: own(h) for t, h in hists.items()}, axis=1).sort_index()
+    return {f: df.xs(f, axis=1, level=1).to_numpy(float) for f in ("close", "lr", "hl", "co")}
+
+
+def vol_estimates(px, lam=EWMA_LAMBDA):
+    """Annualised σ of each column by every estimator, plus daily log-return moments.
+
+    close          std of close-to-close log returns (what return_stats reports)
+    ewma           RiskMetrics zero-mean EWMA, weights λ^k from the name's latest return
+    parkinson      mean ln(H/L)² / 4ln2
+    garman_klass   mean ½ln(H/L)² − (2ln2−1)ln(C/O)²"""
+    lr, hl, co = px["lr"], px["hl"], px["co"]
+    ok   = ~np.isnan(lr)
+    n    = ok.sum(axis=0)
+    mu   = np.nanmean(lr, axis=0)
+    d    = np.where(ok, lr-mu, 0.)
+    m2   = (d**2).sum(axis=0)/np.maximum(n, 1)
+    age  = np.cumsum(ok[::-1], axis=0)[::-1]-1         # own returns after this one
+    w    = np.where(ok, lam**age, 0.)
+    var  = {"close":        (d**2).sum(axis=0)/np.maximum(n-1, 1),
+            "ewma":         (w*np.where(ok, lr, 0.)**2).sum(axis=0)/w.sum(axis=0),
+            "parkinson":    np.nanmean(hl, axis=0)/(4*np.log(2)),
+            "garman_klass": np.nanmean(.5*hl-(2*np.log(2)-1)*co, axis=0)}
+    vols = np.column_stack([np.sqrt(np.maximum(var[k], 0)*252) for k in ESTIMATORS])
+    vols[n < 2] = np.nan
+    # sample-size corrected like pandas' skew() / kurtosis(), which return_stats uses
+    with np.errstate(invalid="ignore", divide="ignore"):
+        g1   = (d**3).sum(axis=0)/np.maximum(n, 1)/m2**1.5
+        g2   = (d**4).sum(axis=0)/np.maximum(n, 1)/m2**2-3
+        skew = g1*np.sqrt(n*(n-1))/(n-2)
+        kurt = ((n+1)*g2+6)*(n-1)/((n-2)*(n-3))
+    return vols, skew, kurt, lr
+
+
+def boot_crash(lr, sigma, crash, T, r, N=SCREEN_N, seed=None, block=BLOCK):
+    """P(S_T/S0 < crash) by resampling one name's standardised daily returns.
+
+    Historical shocks are rescaled to σ and drift r-σ²/2, so the screen keeps the
+    name's empirical fat tails and skew where the analytical score assumes normal
+    ones. Returns (p, se)."""
+    z     = lr[~np.isnan(lr)]
+    z     = (z-z.mean())/z.std()
+    steps = max(int(round(252*T)), 1)
+    rng   = np.random.default_rng(seed)
+    b     = np.log(crash)-(r-.5*sigma**2)*T
+    rows  = max(block//steps, 1)
+    hits  = 0
+    for i in range(0, N, rows):
+        k = min(rows, N-i)
+        hits += int(np.count_nonzero(z[rng.integers(0, len(z), (k, steps))].sum(axis=1)*sigma/np.sqrt(252) < b))
+    p = hits/N
+    return p, np.sqrt(p*(1-p)/N)
+
+
+@dataclass
+class ScreenResult:
+    tickers:   list
+    S0:        np.ndarray
+    vols:      np.ndarray            # (tickers, ESTIMATORS) annual σ
+    skew:      np.ndarray            # daily log-return skewness / excess kurtosis
+    kurt:      np.ndarray
+    analytic:  np.ndarray            # (tickers, ESTIMATORS) Φ(z*) per estimator
+    estimator: str                   # the column used for ranking and refinement
+    flagged:   np.ndarray            # bool per ticker
+    mc:        np.ndarray            # bootstrap P(crash), NaN if not flagged
+    mc_se:     np.ndarray
+    errors:    dict
+    crash:     float
+    T:         float
+    elapsed:   float = 0.
+
+    def frame(self):
+        # sortable table, riskiest first
+        import pandas as pd
+        j  = ESTIMATORS.index(self.estimator)
+        df = pd.DataFrame({"Ticker": self.tickers, "Price": self.S0,
+                           **{f"σ {k}": self.vols[:, i] for i, k in enumerate(ESTIMATORS)},
+                           "Skew": self.skew, "Ex. Kurtosis": self.kurt,
+                           **{f"P {k}": self.analytic[:, i] for i, k in enumerate(ESTIMATORS)},
+                           "Flagged": self.flagged, "P bootstrap MC": self.mc, "MC se": self.mc_se,
+                           "MC / analytic": self.mc/self.analytic[:, j]})
+        return df.sort_values(f"P {self.estimator}", ascending=False, ignore_index=True)
+
+
+def screen(hists, crash=.8, T=1., r=.05, estimator="close", flag_q=FLAG_Q, N=SCREEN_N, seed=None,
+           errors=None):
+    """Score every name in `hists` ({ticker: OHLC frame}) for P(S_T < crash·S0)."""
+    from scipy.stats import norm
+    t0    = time.perf_counter()
+    tick  = list(hists)
+    px    = ohlc_panel(hists)
+    vols, skew, kurt, lr = vol_estimates(px)
+    last  = np.where(~np.isnan(px["close"]), np.arange(len(px["close"]))[:, None], -1).max(axis=0)
+    S0    = px["close"][last, np.arange(len(tick))]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        P = norm.cdf((np.log(crash)-(r-.5*vols**2)*T)/(vols*np.sqrt(T)))
+    P[np.isnan(vols)] = np.nan
+    p     = P[:, ESTIMATORS.index(estimator)]
+    ok    = ~np.isnan(p)
+    flag  = ok & (p >= np.quantile(p[ok], flag_q)) if ok.any() else ok
+    mc, se = np.full(len(tick), np.nan), np.full(len(tick), np.nan)
+    ss    = np.random.SeedSequence(seed, spawn_key=(_STREAM["screener"],))
+    for i, cs in zip(np.flatnonzero(flag), ss.spawn(int(flag.sum()))):
+        mc[i], se[i] = boot_crash(lr[:, i], vols[i, ESTIMATORS.index(estimator)], crash, T, r, N, cs)
+    return ScreenResult(tick, S0, vols, skew, kurt, P, estimator, flag, mc, se, errors or {},
+                        crash, T, time.perf_counter()-t0)
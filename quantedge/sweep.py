@@ -0,0 +1,61 @@
+"""Crash-probability surfaces over threshold × horizon × volatility from one draw."""
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+from .engine import _STREAM
+
+SWEEP_N = 20_000     # common normals shared by every grid point
+BLOCK   = 1 << 20    # grid-points × draws evaluated per IS block (8 MiB buffer)
+
+
+@dataclass
+class SweepResult:
+    crash:    np.ndarray             # thresholds as fractions of S0, axis 0
+    horizons: np.ndarray             # years, axis 1
+    vols:     np.ndarray             # annual σ, axis 2
+    analytic: np.ndarray             # Φ(-d2) on the grid
+    naive:    np.ndarray
+    naive_se: np.ndarray
+    is_:      np.ndarray
+    is_se:    np.ndarray
+    n:        int
+    elapsed:  float = 0.
+
+
+def crash_z(crash, horizons, vols, r):
+    # ST < K  ⇔  Z < z*, broadcast to (crash, horizon, vol)
+    k, T, s = np.log(np.asarray(crash))[:, None, None], np.asarray(horizons)[None, :, None], np.asarray(vols)[None, None, :]
+    return (k-(r-.5*s**2)*T)/(s*np.sqrt(T))
+
+
+def sweep_grid(crash, horizons, vols, r, N=SWEEP_N, seed=None):
+    """Analytical, naive and IS P(crash) on the full grid with common random numbers.
+
+    Every point reuses the same N normals Z. Naive counts #{Z < z*} by binary search
+    on the sorted draws. The IS shift μ = z*-½ makes the shifted event Z < ½ for
+    every point, so IS reduces to sums of exp(-μZ) and exp(-2μZ) over one fixed
+    subset of the draws, evaluated in blocks of grid points."""
+    from scipy.stats import norm
+    t0  = time.perf_counter()
+    z   = crash_z(crash, horizons, vols, r)
+    Z   = np.sort(np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(_STREAM["sweep"],))).standard_normal(N))
+
+    p   = np.searchsorted(Z, z.ravel()).reshape(z.shape)/N
+    mu  = (z-.5).ravel()
+    Zs  = Z[:np.searchsorted(Z, .5)]
+    s1, s2 = np.empty_like(mu), np.empty_like(mu)
+    step = max(BLOCK//max(len(Zs), 1), 1)
+    buf  = np.empty((min(step, len(mu)), len(Zs)))   # every block's weights, in place
+    for i in range(0, len(mu), step):
+        e = buf[:len(mu[i:i+step])]
+        np.multiply.outer(-mu[i:i+step], Zs, out=e)
+        np.exp(e, out=e)
+        s1[i:i+step] = e.sum(axis=1)
+        s2[i:i+step] = np.einsum("ij,ij->i", e, e)
+    m1  = s1*np.exp(-.5*mu**2)/N                 # E[w·1]
+    m2  = s2*np.exp(-mu**2)/N                    # E[(w·1)²]
+    return SweepResult(np.asarray(crash), np.asarray(horizons), np.asarray(vols), norm.cdf(z), p,
+                       np.sqrt(p*(1-p)/N), m1.reshape(z.shape),
+                       np.sqrt(np.maximum(m2-m1**2, 0)/N).reshape(z.shape), N, time.perf_counter()-t0)
@@ -0,0 +1,93 @@
+"""Per-stage wall time, peak memory and array-size records, exportable as JSON lines."""
+import json
+import os
+import threading
+import time
+import tracemalloc
+import uuid
+from contextlib import contextmanager
+
+import numpy as np
+
+SINK = os.environ.get("QUANTEDGE_TELEMETRY")    # append every record to this .jsonl when set
+
+_trace_lock, _active = threading.Lock(), {}    # stage token -> peak bytes seen so far
+
+
+def _fold():
+    # credit the peak since the last reset to every open stage, then restart it;
+    # called (under the lock) whenever a stage opens or closes, so no stage ever
+    # loses a peak that another stage's reset would otherwise wipe
+    peak = tracemalloc.get_traced_memory()[1]
+    for tok in _active:
+        _active[tok] = max(_active[tok], peak)
+    tracemalloc.reset_peak()
+
+
+def array_info(**arrays):
+    # {name: {"shape": [...], "dtype": "...", "mb": ...}} for the ndarrays given
+    return {k: {"shape": list(a.shape), "dtype": str(a.dtype), "mb": a.nbytes/2**20}
+            for k, a in arrays.items() if isinstance(a, np.ndarray)}
+
+
+def arrays_of(obj):
+    # array_info over the ndarray fields of a result (dataclass, dict or tuple)
+    if isinstance(obj, dict):
+        return array_info(**obj)
+    if isinstance(obj, (tuple, list)):
+        return array_info(**{str(i): a for i, a in enumerate(obj)})
+    return array_info(**vars(obj)) if hasattr(obj, "__dict__") else {}
+
+
+class Telemetry:
+    """Collects one record per `stage(...)` block of a run.
+
+    Peak memory comes from tracemalloc (numpy buffers included) and is the
+    process-wide traced peak while the stage was open: concurrent stages and
+    sessions can inflate it, never hide it. Allocations inside worker processes
+    (simulate with workers > 1) are not traced."""
+
+    def __init__(self, kind="run", memory=True, **tags):
+        self.id, self.kind, self.memory, self.tags = uuid.uuid4().hex[:12], kind, memory, tags
+        self.records = []
+
+    @contextmanager
+    def stage(self, name, **info):
+        rec = {"run": self.id, "kind": self.kind, "stage": name, "ts": time.time(), **self.tags, **info}
+        tok = object()
+        if self.memory:
+            with _trace_lock:
+                if _active:
+                    _fold()
+                else:
+                    tracemalloc.start()
+                _active[tok] = 0
+        t0 = time.perf_counter()
+        try:
+            yield rec
+        finally:
+            rec["wall_s"] = time.perf_counter()-t0
+            if self.memory:
+                with _trace_lock:
+                    _fold()
+                    rec["peak_mb"] = _active.pop(tok)/2**20
+                    if not _active:
+                        tracemalloc.stop()
+            self.records.append(rec)
+            if SINK:
+                with _trace_lock, open(SINK, "a") as fh:
+                    fh.write(json.dumps(rec, default=str)+"\n")
+
+    @property
+    def total_s(self):
+        return sum(r["wall_s"] for r in self.records)
+
+    def to_jsonl(self):
+        return "".join(json.dumps(r, default=str)+"\n" for r in self.records)
+
+    def table(self):
+        # flat rows for st.dataframe
+        return [{"kind": r["kind"], "stage": r["stage"], "wall ms": r["wall_s"]*1e3, "peak MB": r.get("peak_mb"),
+                 "cached": "yes" if r.get("cached") else "",
+                 "arrays": ", ".join(f"{k} {'×'.join(map(str, v['shape']))}" for k, v in r.get("arrays", {}).items())}
+                for r in self.records]
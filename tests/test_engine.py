@@ -0,0 +1,36 @@
+import numpy as np
+
+from quantedge.engine import running_bands, simulate
+
+
+def test_running_bands_match_prefix_definition():
+    # a naive row (0/1 crash indicators) and an IS row (likelihood-weighted ones)
+    # stacked the way the convergence chart passes them
+    nm = simulate(100., 80., 1., .05, .2, 2_000, "naive", seed=7)
+    im = simulate(100., 80., 1., .05, .2, 2_000, "is", seed=7)
+    tr = np.vstack([nm.tr, im.tr])
+    mean, se, lo, hi = running_bands(tr)
+    n  = np.arange(1, tr.shape[1]+1)
+    for row, m, s in zip(tr, mean, se):
+        assert np.allclose(m, np.cumsum(row)/n)
+        assert np.allclose(s, [np.std(row[:i+1])/np.sqrt(i+1) for i in range(len(row))], atol=1e-12)
+    assert np.allclose(lo, mean-1.96*se) and np.allclose(hi, mean+1.96*se)
+    assert tr[0].max() == 1 and not np.isin(tr[1], (0, 1)).all()
+
+
+def test_workers_and_progress_do_not_change_results():
+    # N > KEEP so var_cvar comes from the merged sketch, with small chunks so
+    # several GROUPs are split across workers and progress batches
+    args = 100., 80., 1., .05, .2, 60_000
+    for method in ("naive", "is"):
+        seen = []
+        runs = [simulate(*args, method, seed=11, chunk=4_096, workers=1),
+                simulate(*args, method, seed=11, chunk=4_096, workers=2),
+                simulate(*args, method, seed=11, chunk=4_096, progress=lambda n, p, se: seen.append(n))]
+        ref = runs[0]
+        assert len(ref.tr) < ref.n and seen[-1] == ref.n and len(seen) > 1
+        for res in runs[1:]:
+            assert (res.p, res.se, res.n) == (ref.p, ref.se, ref.n)
+            assert np.array_equal(res.tr, ref.tr)
+            assert res.var_cvar(.95) == ref.var_cvar(.95)
+        assert np.isfinite(ref.var_cvar(.95)).all()
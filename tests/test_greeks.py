@@ -0,0 +1,12 @@
+from quantedge.greeks import PARAMS, analytic_greeks, greeks
+
+
+def test_estimators_agree_with_analytic_greeks():
+    # lr is unbiased; smooth and bump carry O(h²) / O(δ²) bias that stays well
+    # inside a few std-errors at this N
+    a = analytic_greeks(100., 80., 1., .05, .2)
+    for method in ("naive", "is"):
+        g = greeks(100., 80., 1., .05, .2, 200_000, method, seed=3)
+        for est in (g.lr, g.smooth, g.bump):
+            for k in PARAMS:
+                assert abs(est[k].mean-a[k]) < 4*est[k].se, (method, k)
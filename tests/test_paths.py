@@ -0,0 +1,11 @@
+from quantedge.paths import barrier_mc, barrier_prob
+
+
+def test_bridge_barrier_matches_closed_form_on_coarse_grids():
+    # the bridge correction makes even 4-step walks unbiased, while the indicator
+    # on the same grid misses crossings between points and reads low
+    p = barrier_prob(100., 80., 1., .05, .2)
+    for steps in (4, 12):
+        res = barrier_mc(100., 80., 1., .05, .2, 100_000, steps=steps, seed=5)
+        assert abs(res["p"]-p) < 4*res["se"]
+        assert p-res["p_discrete"] > 10*res["se_discrete"]